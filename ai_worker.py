@@ -0,0 +1,190 @@
+import threading
+from time import perf_counter
+
+
+class SearchWorker:
+    """
+    Run Board.search in a background thread, so that the caller (the pygame loop) keeps running while
+    the AI thinks. The worker is a non-blocking handle on the result: done() tells whether the search is
+    over, progress() reports how far it went, and move_now() or cancel() stop it early.
+
+    The board is searched in place, moves being made and unmade on it, so it must not be read or played on
+    until the search is over: display a copy made with Board._copy() in the meantime.
+    """
+
+    def __init__(self, board, time_ms: float = None, nodes: int = None, max_depth: int = 64, threads: int = 1, parallel: str = "smp",
+                 age: bool = True) -> None:
+        """
+        Start searching the position for the side to move, see Board.search for the arguments.
+
+        Args:
+            board (Board): Board to search, the stop event of the search is attached to it.
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, counting quiescence nodes, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+            threads (int): Number of processes searching.
+            parallel (str): Parallel search used with several threads.
+            age (bool): Age the killer and history tables first.
+        """
+        self.board     = board
+        self.time_ms   = time_ms
+        self.max_depth = max_depth
+        self.start     = perf_counter()
+        self.__result    = None
+        self.__error     = None
+        self.__cancelled = False
+
+        # The search checks the event once its first iteration has completed, so a move is always found
+        self.stop  = threading.Event()
+        board.stop = self.stop
+        self.__thread = threading.Thread(target=self.__run, args=(time_ms, nodes, max_depth, threads, parallel, age), daemon=True)
+        self.__thread.start()
+
+
+    def __run(self, time_ms: float, nodes: int, max_depth: int, threads: int, parallel: str, age: bool) -> None:
+        """
+        Body of the background thread, keeping the result or the exception of the search for result().
+
+        Args:
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, counting quiescence nodes, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+            threads (int): Number of processes searching.
+            parallel (str): Parallel search used with several threads.
+            age (bool): Age the killer and history tables first.
+
+        Returns:
+            None
+        """
+        try:
+            self.__result = self.board.search(time_ms=time_ms, nodes=nodes, max_depth=max_depth, threads=threads, parallel=parallel, age=age)
+        except BaseException as error:
+            self.__error = error
+
+
+    def done(self) -> bool:
+        """
+        Check whether the search is over, without waiting.
+
+        Returns:
+            bool: True if the result is available.
+        """
+        return not self.__thread.is_alive()
+
+
+    def result(self) -> tuple:
+        """
+        Wait for the end of the search and return its result.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score, as returned by Board.search,
+            or None if the search was cancelled.
+        """
+        self.__thread.join()
+        self.board.stop = None
+        if self.__error is not None:
+            raise self.__error
+        return None if self.__cancelled else self.__result
+
+
+    def progress(self) -> tuple:
+        """
+        Report how far the search went.
+
+        Returns:
+            tuple: Depth of the last completed iteration, nodes searched, seconds elapsed, and seconds left
+            in the time budget or None if the search is only limited by its depth.
+        """
+        stats   = self.board.stats
+        elapsed = perf_counter() - self.start
+        left    = max(0.0, self.time_ms / 1000 - elapsed) if self.time_ms is not None else None
+        return stats.depth, stats.nodes + stats.qnodes, elapsed, left
+
+
+    def move_now(self) -> None:
+        """
+        Stop the search early, result() then returns the best move of the last completed iteration.
+
+        Returns:
+            None
+        """
+        self.stop.set()
+
+
+    def cancel(self) -> None:
+        """
+        Stop the search and wait for the thread to end, discarding its result.
+
+        Returns:
+            None
+        """
+        self.__cancelled = True
+        self.stop.set()
+        self.result()
+
+
+class Ponder:
+    """
+    Search in the background while the human thinks, to fill the transposition table shared with the AI.
+    The reply predicted for the human is the best move stored in the table for the position, left there by
+    the previous search of the AI: the ponder search plays it on a copy of the board and searches the AI's
+    answer. Without a prediction, the position itself is searched.
+
+    When the human plays the predicted move (a ponder hit), the answer found may be played at once,
+    otherwise the AI searches as usual, starting from the entries left by the ponder search.
+    """
+
+    def __init__(self, board) -> None:
+        """
+        Start pondering on a copy of the board, the human's side being to move.
+
+        Args:
+            board (Board): Board of the game, left untouched.
+        """
+        self.board = board._copy()
+        self.board.null_move = board.null_move
+        self.board.ordering  = board.ordering # Killer and history tables of the AI, idle during the human's turn
+
+        entry = board.tt.probe(board.zobrist_key)
+        self.predicted = entry[0] if entry is not None else None
+        if self.predicted is not None and self.predicted not in self.board.legal_moves(self.board.side):
+            self.predicted = None # Collision of the Zobrist keys in the table
+        if self.predicted is not None:
+            self.board.move(*self.predicted)
+
+        # The search only stops when the human plays. The tables are aged once per move, by the search of the AI
+        self.worker = SearchWorker(self.board, age=False)
+
+
+    def stop(self, coord: tuple, move: tuple, depth: int, move_time: float) -> tuple:
+        """
+        Stop pondering once the human has played, and tell whether the answer found can be played without searching.
+
+        Args:
+            coord (tuple): Coordinates of the piece moved by the human.
+            move (tuple): Coordinates of its destination square.
+            depth (int): Depth of the searches of the AI.
+            move_time (float): Time budget of the AI per move in milliseconds, or None.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the AI's answer if the
+            human played the predicted move and the ponder search went as deep or as long as a search of the AI, else None.
+        """
+        self.worker.move_now()
+        result = self.worker.result()
+        if self.predicted != (coord, move) or result[0] is None:
+            return None
+        stats = self.board.stats
+        if stats.depth >= depth or (move_time is not None and stats.elapsed * 1000 >= move_time):
+            return result
+        return None
+
+
+    def cancel(self) -> None:
+        """
+        Stop pondering, when the game ends during the human's turn.
+
+        Returns:
+            None
+        """
+        self.worker.cancel()
@@ -0,0 +1,493 @@
+import numpy as np
+from numpy.typing import ArrayLike
+from board_ia import Board, INITIAL_PIECES
+from piece import PieceValues, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+from transposition import TranspositionTable
+from zobrist import ZOBRIST_PIECES, ZOBRIST_SIDE, ZOBRIST_CASTLING, CASTLING_PIECES, square_key
+
+# Squares are numbered y * 8 + x, so that White pawns move toward lower squares
+SQUARES = [(sq & 7, sq >> 3) for sq in range(64)] # Square index to (x, y) coordinates
+BITS    = [1 << sq for sq in range(64)]
+
+PAWN   = PieceValues.PAWN_WHITE.value
+KNIGHT = PieceValues.KNIGHT_WHITE.value
+BISHOP = PieceValues.BISHOP_WHITE.value
+ROOK   = PieceValues.ROOK_WHITE.value
+QUEEN  = PieceValues.QUEEN_WHITE.value
+KING   = PieceValues.KING_WHITE.value
+
+FILE_A = sum(BITS[y * 8] for y in range(8))
+FILE_H = FILE_A << 7
+
+
+def _mask(squares: list) -> int:
+    """
+    Build the bitboard of a list of (x, y) coordinates.
+
+    Args:
+        squares (list): List of coordinates.
+
+    Returns:
+        int: Bitboard with one bit set per square.
+    """
+    mask = 0
+    for x, y in squares:
+        mask |= BITS[y * 8 + x]
+    return mask
+
+
+# Leaper attack tables, built from the coordinate tables of piece.py
+KNIGHT_MASKS = [_mask(KNIGHT_ATTACKS[x][y]) for x, y in SQUARES]
+KING_MASKS   = [_mask(KING_ATTACKS[x][y]) for x, y in SQUARES]
+PAWN_MASKS   = {color: [_mask(PAWN_ATTACKS[color][x][y]) for x, y in SQUARES] for color in (1, -1)}
+
+# Ray tables: RAYS[direction][square] holds every square from the square to the edge of the board
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+ROOK_DIRS   = (0, 1, 2, 3)
+BISHOP_DIRS = (4, 5, 6, 7)
+POSITIVE    = [dy * 8 + dx > 0 for dx, dy in DIRECTIONS] # Direction toward higher square indices
+
+
+def _ray(sq: int, dx: int, dy: int) -> list:
+    """
+    List the squares met from a square in a direction, nearest first.
+
+    Args:
+        sq (int): Start square index.
+        dx (int): Step along x.
+        dy (int): Step along y.
+
+    Returns:
+        list: List of square indices.
+    """
+    x, y = SQUARES[sq]
+    squares = []
+    x, y = x + dx, y + dy
+    while 0 <= x <= 7 and 0 <= y <= 7:
+        squares.append(y * 8 + x)
+        x, y = x + dx, y + dy
+    return squares
+
+
+RAYS = [[sum(BITS[s] for s in _ray(sq, dx, dy)) for sq in range(64)] for dx, dy in DIRECTIONS]
+
+# BETWEEN[a][b]: squares strictly between two aligned squares, 0 if they are not aligned
+BETWEEN = [[0] * 64 for _ in range(64)]
+for _sq in range(64):
+    for _dx, _dy in DIRECTIONS:
+        _squares = _ray(_sq, _dx, _dy)
+        for _i, _target in enumerate(_squares):
+            BETWEEN[_sq][_target] = sum(BITS[s] for s in _squares[:_i])
+
+
+def _slider_attacks(sq: int, occupied: int, directions: tuple) -> int:
+    """
+    Compute the attacks of a sliding piece with the classical ray lookup: each ray is cut
+    after its first blocker, found as the lowest or highest set bit of the blocked ray.
+
+    Args:
+        sq (int): Square of the sliding piece.
+        occupied (int): Bitboard of the occupied squares.
+        directions (tuple): Indices of the directions in DIRECTIONS.
+
+    Returns:
+        int: Bitboard of the attacked squares.
+    """
+    attacks = 0
+    for d in directions:
+        ray = RAYS[d][sq]
+        blockers = ray & occupied
+        if blockers:
+            if POSITIVE[d]:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= RAYS[d][blocker]
+        attacks |= ray
+    return attacks
+
+
+def _squares_of(bitboard: int):
+    """
+    Iterate over the squares of a bitboard, lowest first.
+
+    Args:
+        bitboard (int): Bitboard to scan.
+
+    Yields:
+        int: Square index of each set bit.
+    """
+    while bitboard:
+        bit = bitboard & -bitboard
+        yield bit.bit_length() - 1
+        bitboard ^= bit
+
+
+class BitBoard(Board):
+    """
+    Board backend storing the position as twelve piece bitboards (Python ints) plus occupancy masks.
+    Move generation works with shifts and masks on whole bitboards and precomputed ray tables,
+    while the search, the evaluation and the transposition table are inherited from Board.
+    """
+    def __init__(self, initial_pieces: ArrayLike = INITIAL_PIECES, moved: ArrayLike=[], tt: TranspositionTable = None, threat: bool = False, defense: bool = False, zobrist_key: int = None) -> None:
+        """
+        Initialize the board, see Board for the arguments.
+        """
+        super().__init__(initial_pieces, moved, tt, threat, defense, zobrist_key)
+        self.__undo_stack = [] # Undo records pushed by make_move() and popped by unmake_move()
+
+
+    def _set_position(self, grid: ArrayLike, moved: ArrayLike) -> None:
+        """
+        Build the bitboards from a piece layout and the moved pieces.
+
+        Args:
+            grid (np.array): 2D array representing the piece layout.
+            moved (np.array): 2D array tracking moved pieces for castling and pawn promotions.
+        """
+        self.__squares   = [0] * 64 # Piece value on each square, for direct lookups
+        self.__bitboards = {piece.value: 0 for piece in PieceValues}
+        self.__occupied  = {1: 0, -1: 0}
+        self.__moved     = 0
+        for sq, (x, y) in enumerate(SQUARES):
+            piece = int(grid[x, y])
+            if piece != 0:
+                self.__squares[sq] = piece
+                self.__bitboards[piece] |= BITS[sq]
+                self.__occupied[1 if piece > 0 else -1] |= BITS[sq]
+            if moved[x, y]:
+                self.__moved |= BITS[sq]
+
+
+    @property
+    def grid(self) -> ArrayLike:
+        """
+        2D array of the piece layout indexed by [x, y], built on demand for display and evaluation.
+
+        Returns:
+            np.array: Piece layout.
+        """
+        return np.array(self.__squares, dtype=np.int64).reshape(8, 8).T
+
+
+    @property
+    def pieces(self) -> dict:
+        """
+        Coordinates of the pieces of each color, read from the occupancy bitboards.
+
+        Returns:
+            dict: Lists of coordinates indexed by color.
+        """
+        return {color: [SQUARES[sq] for sq in _squares_of(self.__occupied[color])] for color in (1, -1)}
+
+
+    @property
+    def kings(self) -> dict:
+        """
+        Coordinates of the king of each color, read from the king bitboards.
+
+        Returns:
+            dict: Coordinates indexed by color, colors without a king are missing.
+        """
+        return {color: SQUARES[self.__bitboards[KING * color].bit_length() - 1]
+                for color in (1, -1) if self.__bitboards[KING * color]}
+
+
+    def _moved_grid(self) -> ArrayLike:
+        """
+        Return the moved pieces as a 2D array, as expected by the constructor.
+
+        Returns:
+            np.array: 2D boolean array of the squares touched by a move.
+        """
+        return np.array([bool(self.__moved & bit) for bit in BITS]).reshape(8, 8).T
+
+
+    def __getitem__(self, key: tuple) -> int:
+        """
+        Allow square access through board[key].
+
+        Args:
+            key (tuple): Position on the board as (x, y) coordinates.
+
+        Returns:
+            int: Piece value at the given position.
+        """
+        x, y = key
+        return self.__squares[y * 8 + x]
+
+
+    def __setitem__(self, key: tuple, value: int) -> None:
+        """
+        Allow square modification by setting board[key] = value.
+
+        Args:
+            key (tuple): Position on the board as (x, y) coordinates.
+            value (int): Piece value to be placed at the position.
+        """
+        x, y = key
+        sq = y * 8 + x
+        moved = bool(self.__moved & BITS[sq])
+        old = self.__remove(sq)
+        self.material += int(value) - old
+        self.zobrist_key ^= square_key(old, x, y, moved) ^ square_key(int(value), x, y, moved)
+        if value != 0:
+            self.__put(sq, int(value))
+
+
+    def __put(self, sq: int, piece: int) -> None:
+        """
+        Place a piece on an empty square.
+
+        Args:
+            sq (int): Square index.
+            piece (int): Piece value.
+
+        Returns:
+            None
+        """
+        self.__squares[sq] = piece
+        self.__bitboards[piece] |= BITS[sq]
+        self.__occupied[1 if piece > 0 else -1] |= BITS[sq]
+
+
+    def __remove(self, sq: int) -> int:
+        """
+        Remove the piece of a square, if any.
+
+        Args:
+            sq (int): Square index.
+
+        Returns:
+            int: Value of the removed piece, 0 if the square was empty.
+        """
+        piece = self.__squares[sq]
+        if piece != 0:
+            self.__squares[sq] = 0
+            self.__bitboards[piece] ^= BITS[sq]
+            self.__occupied[1 if piece > 0 else -1] ^= BITS[sq]
+        return piece
+
+
+    def _attackers(self, sq: int, color: int, occupied: int) -> int:
+        """
+        Compute the pieces of a color attacking a square.
+
+        Args:
+            sq (int): Square index.
+            color (int): Color of the attacking pieces, positive for White, negative for Black.
+            occupied (int): Bitboard of the occupied squares blocking the sliding pieces.
+
+        Returns:
+            int: Bitboard of the attacking pieces.
+        """
+        bitboards = self.__bitboards
+        queens = bitboards[QUEEN * color]
+        return ((PAWN_MASKS[-color][sq] & bitboards[PAWN * color])
+                | (KNIGHT_MASKS[sq] & bitboards[KNIGHT * color])
+                | (KING_MASKS[sq] & bitboards[KING * color])
+                | (_slider_attacks(sq, occupied, ROOK_DIRS) & (bitboards[ROOK * color] | queens))
+                | (_slider_attacks(sq, occupied, BISHOP_DIRS) & (bitboards[BISHOP * color] | queens)))
+
+
+    def _is_check(self, color: int) -> bool:
+        """
+        Determine if the specified color is in check.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+
+        Returns:
+            bool: True if color's king is in check, False otherwise.
+        """
+        king = self.__bitboards.get(KING * color)
+        if not king:
+            return False
+        occupied = self.__occupied[1] | self.__occupied[-1]
+        return self._attackers(king.bit_length() - 1, -color, occupied) != 0
+
+
+    def iter_legal_moves(self, color: int, from_mask: int = -1):
+        """
+        Generate lazily the legal moves of the specified color, filtered with check and pin masks.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+            from_mask (int): Bitboard of the pieces to generate moves for, every piece by default.
+
+        Yields:
+            tuple: Legal move as (piece coordinates, move coordinates).
+        """
+        bitboards = self.__bitboards
+        own       = self.__occupied[color]
+        enemy     = self.__occupied[-color]
+        occupied  = own | enemy
+        empty     = ~occupied
+        king_bb   = bitboards[KING * color]
+
+        # Check and pin masks, computed once for the position
+        checkers  = 0
+        check     = -1 # Squares that stop the check, every square when not in check
+        pins      = {}
+        if king_bb:
+            king = king_bb.bit_length() - 1
+            checkers = self._attackers(king, -color, occupied)
+            if checkers:
+                check = 0 if checkers & (checkers - 1) else checkers | BETWEEN[king][checkers.bit_length() - 1]
+            queens = bitboards[-QUEEN * color]
+            snipers = ((_slider_attacks(king, enemy, ROOK_DIRS) & (bitboards[-ROOK * color] | queens))
+                       | (_slider_attacks(king, enemy, BISHOP_DIRS) & (bitboards[-BISHOP * color] | queens)))
+            for sniper in _squares_of(snipers):
+                between = BETWEEN[king][sniper] & occupied
+                if between and not between & (between - 1) and between & own:
+                    pins[between.bit_length() - 1] = BETWEEN[king][sniper] | BITS[sniper]
+
+        def legal(from_sq: int, targets: int):
+            targets &= check
+            if from_sq in pins:
+                targets &= pins[from_sq]
+            coord = SQUARES[from_sq]
+            for to_sq in _squares_of(targets):
+                yield coord, SQUARES[to_sq]
+
+        if check:
+            # Pawns: set-wise pushes and captures, then mapped back to their start square
+            pawns = bitboards[PAWN * color] & from_mask
+            if color > 0:
+                single  = (pawns >> 8) & empty
+                double  = ((((pawns & ~self.__moved) >> 8) & empty) >> 8) & empty
+                left    = ((pawns & ~FILE_A) >> 9) & enemy
+                right   = ((pawns & ~FILE_H) >> 7) & enemy
+                offsets = ((single, 8), (double, 16), (left, 9), (right, 7))
+            else:
+                single  = (pawns << 8) & empty
+                double  = ((((pawns & ~self.__moved) << 8) & empty) << 8) & empty
+                left    = ((pawns & ~FILE_A) << 7) & enemy
+                right   = ((pawns & ~FILE_H) << 9) & enemy
+                offsets = ((single, -8), (double, -16), (left, -7), (right, -9))
+            for targets, offset in offsets:
+                for to_sq in _squares_of(targets & 0xFFFFFFFFFFFFFFFF):
+                    yield from legal(to_sq + offset, BITS[to_sq])
+
+            for from_sq in _squares_of(bitboards[KNIGHT * color] & from_mask):
+                yield from legal(from_sq, KNIGHT_MASKS[from_sq] & ~own)
+            for from_sq in _squares_of(bitboards[BISHOP * color] & from_mask):
+                yield from legal(from_sq, _slider_attacks(from_sq, occupied, BISHOP_DIRS) & ~own)
+            for from_sq in _squares_of(bitboards[ROOK * color] & from_mask):
+                yield from legal(from_sq, _slider_attacks(from_sq, occupied, ROOK_DIRS) & ~own)
+            for from_sq in _squares_of(bitboards[QUEEN * color] & from_mask):
+                yield from legal(from_sq, (_slider_attacks(from_sq, occupied, ROOK_DIRS)
+                                           | _slider_attacks(from_sq, occupied, BISHOP_DIRS)) & ~own)
+
+        if king_bb & from_mask:
+            # The king is lifted from the occupancy so that it does not hide the squares behind it from sliders
+            without_king = occupied ^ king_bb
+            coord = SQUARES[king]
+            king_moves = [SQUARES[to_sq] for to_sq in _squares_of(KING_MASKS[king] & ~own)
+                          if not self._attackers(to_sq, -color, without_king)]
+
+            # Castling: unmoved king and rook, empty squares in between, no attacked square on the king's path
+            if not checkers and not self.__moved & king_bb:
+                x, y = coord
+                if (x + 3 <= 7 and not self.__moved & BITS[king + 3] and not occupied & (BITS[king + 1] | BITS[king + 2])
+                        and not self._attackers(king + 1, -color, occupied) and not self._attackers(king + 2, -color, occupied)):
+                    king_moves.append((x + 2, y))
+                if (x - 4 >= 0 and not self.__moved & BITS[king - 4]
+                        and not occupied & (BITS[king - 1] | BITS[king - 2] | BITS[king - 3])
+                        and not self._attackers(king - 1, -color, occupied) and not self._attackers(king - 2, -color, occupied)):
+                    king_moves.append((x - 2, y))
+
+            for move in king_moves:
+                yield coord, move
+
+
+    def possible_moves(self, piece_coord: tuple) -> list:
+        """
+        Generate legal moves for a piece at the given coordinates.
+
+        Args:
+            piece_coord (tuple): Coordinates of the piece to move.
+
+        Returns:
+            list: List of legal move coordinates.
+        """
+        x, y = piece_coord
+        color = 1 if self[piece_coord] > 0 else -1
+        return [move for _, move in self.iter_legal_moves(color, BITS[y * 8 + x])]
+
+
+    def make_move(self, coord: tuple, new_coord: tuple) -> None:
+        """
+        Apply a move in place and push an undo record so that unmake_move() can restore the position.
+
+        Args:
+            coord (tuple): Current piece coordinates.
+            new_coord (tuple): New piece coordinates.
+
+        Returns:
+            None
+        """
+        x, y         = coord
+        new_x, new_y = new_coord
+        from_sq      = y * 8 + x
+        to_sq        = new_y * 8 + new_x
+        self.__undo_stack.append((from_sq, to_sq, self.__squares[from_sq], self.__squares[to_sq], self.__moved, self.zobrist_key, self.material))
+
+        piece    = self.__remove(from_sq)
+        captured = self.__remove(to_sq)
+        key      = self.zobrist_key ^ ZOBRIST_PIECES[piece][x][y] ^ ZOBRIST_SIDE
+        if abs(piece) in CASTLING_PIECES and not self.__moved & BITS[from_sq]:
+            key ^= ZOBRIST_CASTLING[x][y]
+        if captured != 0:
+            key ^= ZOBRIST_PIECES[captured][new_x][new_y]
+            self.material -= captured
+            if abs(captured) in CASTLING_PIECES and not self.__moved & BITS[to_sq]:
+                key ^= ZOBRIST_CASTLING[new_x][new_y]
+        self.__moved |= BITS[from_sq] | BITS[to_sq]
+
+        # Castling: the rook jumps over the king
+        if abs(piece) == KING and abs(new_x - x) == 2:
+            rook_from, rook_to = (to_sq + 1, to_sq - 1) if new_x > x else (to_sq - 2, to_sq + 1)
+            rook = self.__remove(rook_from)
+            if rook != 0:
+                self.__put(rook_to, rook)
+                key ^= ZOBRIST_PIECES[rook][rook_from & 7][new_y] ^ ZOBRIST_PIECES[rook][rook_to & 7][new_y]
+                if not self.__moved & BITS[rook_from]:
+                    key ^= ZOBRIST_CASTLING[rook_from & 7][new_y]
+            self.__moved |= BITS[rook_from]
+
+        # Promotion to a queen
+        if abs(piece) == PAWN and ((new_y == 0 and piece > 0) or (new_y == 7 and piece < 0)):
+            piece = QUEEN if piece > 0 else -QUEEN
+            self.material += piece - (PAWN if piece > 0 else -PAWN)
+
+        self.__put(to_sq, piece)
+        self.zobrist_key = key ^ ZOBRIST_PIECES[piece][new_x][new_y]
+        self.side = -self.side
+
+
+    def unmake_move(self) -> None:
+        """
+        Restore the position as it was before the last make_move() call.
+
+        Returns:
+            None
+        """
+        from_sq, to_sq, piece, captured, moved, key, material = self.__undo_stack.pop()
+        self.__remove(to_sq)
+
+        # Castling: put the rook back on its square
+        if abs(piece) == KING and abs((to_sq & 7) - (from_sq & 7)) == 2:
+            rook_from, rook_to = (to_sq + 1, to_sq - 1) if to_sq > from_sq else (to_sq - 2, to_sq + 1)
+            rook = self.__remove(rook_to)
+            if rook != 0:
+                self.__put(rook_from, rook)
+
+        # The original piece is restored, which also undoes a promotion
+        self.__put(from_sq, piece)
+        if captured != 0:
+            self.__put(to_sq, captured)
+        self.__moved = moved
+        self.zobrist_key = key
+        self.material    = material
+        self.side        = -self.side
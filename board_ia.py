@@ -1,6 +1,15 @@
+from math import log
+from time import perf_counter
+from typing import Callable
 import numpy as np
 from numpy.typing import ArrayLike
-from piece import MovePieces, PieceValues
+from piece import MovePieces, PieceValues, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BISHOP_RAYS
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from move_ordering import MoveOrderer, PROMOTION_GAIN
+from lazy_smp import LazySMP
+from root_split import RootSplit
+from ybwc import YBWC
+from zobrist import ZOBRIST_PIECES, ZOBRIST_SIDE, ZOBRIST_CASTLING, CASTLING_PIECES, zobrist_hash, square_key
 
 # List of initial pieces
 INITIAL_PIECES = np.array([
@@ -32,12 +41,152 @@ INITIAL_PIECES = np.array([
 # INITIAL_PIECES[6, 2] = PieceValues.KING_BLACK.value
 # INITIAL_PIECES[1, 1] = PieceValues.PAWN_WHITE.value
 
+# Score of a checkmate, from the point of view of the winner, reduced by the number of plies to the mate
+MATE_SCORE = 1e6
+MAX_PLY    = 256 # Longest line the search can reach
+MATE_BOUND = MATE_SCORE - MAX_PLY # Scores beyond this bound are mates
+
+# Maximum number of check extensions along a line
+MAX_EXTENSIONS = 6
+
+# Number of nodes between two checks of the time and node budgets
+CHECK_EVERY = 256
+
+# Depth reductions of the null-move search, the larger one is used from NULL_MOVE_DEEP on
+NULL_MOVE_R      = 2
+NULL_MOVE_DEEP_R = 3
+NULL_MOVE_DEEP   = 7
+
+# Aspiration windows: half-width of the first window around the previous score, and the depth from which they are used
+ASPIRATION_WINDOW = 15
+ASPIRATION_DEPTH  = 3
+
+# Size in megabytes of the transposition table of a board created without one, games pass a table of the size asked
+DEFAULT_HASH_MB = 1
+
+# Parallel searches selectable in Board.search
+PARALLEL_SEARCHES = {"smp": LazySMP, "root": RootSplit, "ybwc": YBWC}
+
+# Late move reductions: quiet moves from the LMR_MIN_MOVES-th on are searched at a reduced depth,
+# read in a table indexed by [remaining depth][move number]
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_TABLE = [[0 if depth == 0 or number == 0 else int(0.75 + log(depth) * log(number) / 2.25) for number in range(64)]
+             for depth in range(64)]
+
+# Late move pruning: number of moves after which the quiet moves are skipped, indexed by remaining depth
+LMP_COUNTS = [0, 8, 12, 18]
+
+# Safety margin of the delta pruning in the quiescence search, two pawns
+DELTA_MARGIN = 2 * PieceValues.PAWN_WHITE.value
+
+
+def score_to_tt(score: float, ply: int) -> float:
+    """
+    Convert a score for the transposition table: mate scores are counted from the root of the search,
+    but stored counted from the position, which may be reached at another ply later.
+
+    Args:
+        score (float): Score of the position, mate scores counted from the root.
+        ply (int): Distance of the position to the root.
+
+    Returns:
+        float: Score to store.
+    """
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: float, ply: int) -> float:
+    """
+    Convert a score read from the transposition table back to a mate distance counted from the root.
+
+    Args:
+        score (float): Stored score.
+        ply (int): Distance of the position to the root.
+
+    Returns:
+        float: Score of the position, mate scores counted from the root.
+    """
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when its time or node budget is exhausted, to unwind to the driver.
+    """
+
+
+class SearchStats:
+    """
+    Counters and results of a search, filled by Board.search and Board.negamax.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize empty counters.
+        """
+        self.nodes = 0 # Nodes visited by negamax
+        self.qnodes = 0 # Nodes visited by the quiescence search, not counted in nodes
+        self.null_tries = 0 # Null-move searches
+        self.null_cutoffs = 0 # Null-move searches that cut the node off
+        self.reductions = 0 # Late moves searched at a reduced depth
+        self.researches = 0 # Reduced searches that beat the window and were searched again at full depth
+        self.pruned = 0 # Late quiet moves skipped by late move pruning
+        self.pvs_researches = 0 # Null-window searches that failed high and were searched again with the full window
+        self.fail_highs = 0 # Aspiration windows the root score went above
+        self.fail_lows = 0 # Aspiration windows the root score went below
+        self.cutoffs = 0 # Nodes where the search failed high or low
+        self.first_move_cutoffs = 0 # Cutoffs produced by the first move tried, measures the move ordering
+        self.splits = 0 # Nodes whose younger moves were shared with the helpers of the YBWC search
+        self.depth = 0 # Depth of the last completed iteration
+        self.threads = 1 # Number of processes that took part in the search
+        self.elapsed = 0.0 # Duration of the search in seconds
+        self.best_move = None # Best move of the last completed iteration, as (piece coordinates, move coordinates)
+        self.score = 0 # Score of the best move from White's point of view
+
+
+    def __str__(self) -> str:
+        """
+        Summarize the search on one line.
+
+        Returns:
+            str: Readable summary.
+        """
+        total = self.nodes + self.qnodes
+        nps = total / self.elapsed if self.elapsed > 0 else 0
+        return (f"depth {self.depth}, score {self.score}, {self.threads} thread(s), {total} nodes ({self.qnodes} in quiescence) "
+                f"in {self.elapsed:.2f}s ({nps:.0f} nodes/s), {self.null_cutoffs}/{self.null_tries} null-move cutoffs, "
+                f"{self.researches}/{self.reductions} reductions searched again ({self.research_rate():.0%}), {self.pruned} moves pruned, {self.pvs_researches} PVS re-searches, "
+                f"{self.fail_highs} fail highs and {self.fail_lows} fail lows, {self.splits} split points")
+
+
+    def research_rate(self) -> float:
+        """
+        Return the fraction of late move reductions that had to be searched again at full depth.
+
+        Returns:
+            float: Re-search rate between 0 and 1.
+        """
+        return self.researches / self.reductions if self.reductions else 0.0
+
+
 class Board:
     """
     Class to represent and manage the chessboard state, including piece positions,
     move tracking, and board evaluations for minimax calculations.
     """
-    def __init__(self, initial_pieces: ArrayLike = INITIAL_PIECES, moved: ArrayLike=[], max_best_piece_coord_table: dict={}, max_best_move_table: dict = {}, max_eval_table: dict={}, min_best_piece_coord_table: dict={}, min_best_move_table: dict = {}, min_eval_table: dict={}, threat: bool = False, defense: bool = False) -> None:
+    check_incremental = False # If True, the incremental evaluation is cross-checked against a full recompute
+    quiescence_evasions = False # If True, the quiescence search tries every move when the side to move is in check
+    null_move = True # If True, minimax prunes the nodes where passing the turn still fails high or low
+    root_rotation = 0 # Number of places the root moves after the first are rotated by, so that Lazy SMP helpers search different trees
+    def __init__(self, initial_pieces: ArrayLike = INITIAL_PIECES, moved: ArrayLike=[], tt: TranspositionTable = None, threat: bool = False, defense: bool = False, zobrist_key: int = None) -> None:
         """
         Initialize the Board with pieces in starting positions, moved status for special moves,
         and an optional transposition table for memoization.
@@ -45,38 +194,78 @@ class Board:
         Args:
             initial_pieces (np.array): Initial 2D array representing the piece layout.
             moved (np.array): 2D array tracking moved pieces for castling and pawn promotions.
-            __best_piece_coord_table (dict): Optional dictionary for caching best piece coordinates.
-            __best_move_table (dict): Optional dictionary for caching best move coordinates.
-            eval_table (dict): Optional dictionary for caching board states to optimize calculations.
+            tt (TranspositionTable): Optional transposition table, a small one (DEFAULT_HASH_MB) is allocated if not given.
             threat (bool): If True, adds points for threatening opposing pieces.
             defense (bool): If True, reduces points for defending pieces.
+            zobrist_key (int): Zobrist key of the layout, computed from scratch if not given.
         """
         # Board grid layout and tracking moved pieces for castling and pawn promotions
-        self.grid = initial_pieces.copy()
-        if len(moved) != 0:
-            self.__moved = moved
-        else:
-            self.__moved = ~np.isin(abs(self.grid), 
+        if len(moved) == 0:
+            moved = ~np.isin(abs(initial_pieces), 
                             [PieceValues.KING_WHITE.value, 
                             PieceValues.ROOK_WHITE.value, 
                             PieceValues.PAWN_WHITE.value])
+        self._set_position(initial_pieces, moved)
         self.turn = 0  # Tracks the current turn (0: White, 1: Black)
+        self.side = 1  # Color to move, flipped by make_move() and unmake_move() (1: White, -1: Black)
         self.checkmate = False # Checkmate status flag
 
-        # Max evaluation table for memoization
-        self.__max_best_piece_coord_table = max_best_piece_coord_table # Cache of best piece coordinates
-        self.__max_best_move_table        = max_best_move_table # Cache of best move coordinates
-        self.__max_eval_table             = max_eval_table # Cache of board states and scores
+        # Zobrist key of the position, updated incrementally by move()
+        self.zobrist_key = zobrist_hash(self.grid, self._moved_grid()) if zobrist_key is None else zobrist_key
+        self.__undo_stack = [] # Undo records pushed by make_move() and popped by unmake_move()
+
+        # Material balance (sum of the piece values), updated incrementally by make_move()
+        self.material = self._material_from_scratch()
+
+        # Transposition table for memoization, shared with the copies of the board
+        self.tt = tt if tt is not None else TranspositionTable(DEFAULT_HASH_MB)
 
-        # Min evaluation table for memoization
-        self.__min_best_piece_coord_table = min_best_piece_coord_table # Cache of best piece coordinates
-        self.__min_best_move_table        = min_best_move_table # Cache of best move coordinates
-        self.__min_eval_table             = min_eval_table # Cache of board states and scores
+        # Statistics and budgets of the current search
+        self.stats = SearchStats()
+        self.ordering = MoveOrderer() # Killer and history tables, kept between the moves of a game
+        self.__deadline = None # perf_counter() value at which the search must stop
+        self.__node_limit = None # Number of nodes after which the search must stop
+        self.stop = None # Event set by another thread or process to stop the current search
+        self.__stop = None # self.stop once the first iteration of the search has completed
+        self.parallel = None # Helper processes of the parallel search, started by the first search with several threads
+        self.splitter = None # YBWC search sharing the younger moves of the nodes with its helpers, during its searches
 
         self.__threat = threat
         self.__defense = defense
 
 
+    def _set_position(self, grid: ArrayLike, moved: ArrayLike) -> None:
+        """
+        Store the piece layout and the moved pieces in the board representation.
+
+        Args:
+            grid (np.array): 2D array representing the piece layout.
+            moved (np.array): 2D array tracking moved pieces for castling and pawn promotions.
+        """
+        self.grid = grid.copy()
+        self.__moved = moved
+
+        # Piece lists and king squares of each color, maintained by make_move() and unmake_move()
+        self.pieces = {1: [], -1: []}
+        self.kings  = {}
+        for x, y in zip(*np.where(self.grid != 0)):
+            coord = (int(x), int(y))
+            color = 1 if self.grid[coord] > 0 else -1
+            self.pieces[color].append(coord)
+            if abs(self.grid[coord]) == PieceValues.KING_WHITE.value:
+                self.kings[color] = coord
+
+
+    def _moved_grid(self) -> ArrayLike:
+        """
+        Return a copy of the moved pieces as a 2D array, as expected by the constructor.
+
+        Returns:
+            np.array: 2D boolean array of the squares touched by a move.
+        """
+        return self.__moved.copy()
+
+
     def __getitem__(self, key: tuple) -> None:
         """
         Allow grid access through board[key].
@@ -98,70 +287,31 @@ class Board:
             key (tuple): Position on the grid as (x, y) coordinates.
             value (int): Piece value to be placed at the position.
         """
+        coord = (int(key[0]), int(key[1]))
+        for color in (1, -1):
+            if coord in self.pieces[color]:
+                self.pieces[color].remove(coord)
+            if self.kings.get(color) == coord:
+                del self.kings[color]
+        self.material += int(value) - int(self.grid[key])
+        moved = bool(self.__moved[coord])
+        self.zobrist_key ^= square_key(int(self.grid[key]), *coord, moved) ^ square_key(int(value), *coord, moved)
         self.grid[key] = value
+        if value != 0:
+            color = 1 if value > 0 else -1
+            self.pieces[color].append(coord)
+            if abs(value) == PieceValues.KING_WHITE.value:
+                self.kings[color] = coord
 
 
-    def _hash_state(self) -> int:
+    def _material_from_scratch(self) -> int:
         """
-        Generate a unique hash for the current board state to use in the transposition table.
+        Recompute the material balance from the piece layout, to initialize or cross-check the running one.
 
         Returns:
-            int: Hash value representing the current board layout.
+            int: Sum of the piece values on the board.
         """
-        return hash(str(self.grid.flatten()))
-    
-
-    def _memoized(self, maximizing: bool, hash_key: str) -> dict:
-        """
-        Return the appropriate transposition table based on the current player.
-
-        Args:
-            maximizing (bool): True if maximizing player, False if minimizing.
-
-        Returns:
-            dict: Transposition table for the current player.
-        """
-        if maximizing:
-            return hash_key in self.__max_eval_table
-        else:
-            return hash_key in self.__min_eval_table
-        
-
-    def _get_memoized(self, maximizing: bool, hash_key: str) -> tuple:
-        """
-        Retrieve the best piece and move coordinates and the evaluation score from the transposition table.
-
-        Args:
-            maximizing (bool): True if maximizing player, False if minimizing.
-            hash_key (str): Hash value representing the current board layout.
-
-        Returns:
-            tuple: Best piece coordinates, best move coordinates, and the evaluation score.
-        """
-        if maximizing:
-            return self.__max_best_piece_coord_table[hash_key], self.__max_best_move_table[hash_key], self.__max_eval_table[hash_key]
-        else:
-            return self.__min_best_piece_coord_table[hash_key], self.__min_best_move_table[hash_key], self.__min_eval_table[hash_key]
-    
-    
-    def _fill_tables(self, maximizing:bool, hash_key: int, best_piece_coord: tuple, best_move: tuple, eval: float) -> None:
-        """
-        Fill the transposition tables with the best piece and move coordinates and the evaluation score.
-
-        Args:
-            hash_key (int): Hash value representing the current board layout.
-            best_piece_coord (tuple): Best piece coordinates for the current player.
-            best_move (tuple): Best move coordinates for the current player.
-            eval (float): Evaluation score for the current board state.
-        """
-        if maximizing:
-            self.__max_best_piece_coord_table[hash_key] = best_piece_coord
-            self.__max_best_move_table[hash_key]        = best_move
-            self.__max_eval_table[hash_key]             = eval
-        else:
-            self.__min_best_piece_coord_table[hash_key] = best_piece_coord
-            self.__min_best_move_table[hash_key]        = best_move
-            self.__min_eval_table[hash_key]             = eval
+        return int(self.grid.sum())
 
 
     def _evaluate_board(self, threat: bool = False, defense: bool = False) -> float:
@@ -175,11 +325,14 @@ class Board:
         Returns:
             float: Calculated board score.
         """
-        score = self.grid.sum()
+        # The running material balance makes the evaluation O(1) when threat and defense are off
+        score = self.material
+        if self.check_incremental:
+            assert score == self._material_from_scratch(), "Incremental material out of sync with the board"
 
          # If threat assessment is enabled, adds a small score boost for threatening opponent pieces
         if threat:
-            for coord in zip(*np.where(self.grid * self.turn > 10)):
+            for coord in [coord for color in (1, -1) for coord in self.pieces[color] if self[coord] * self.turn > 10]:
                 possible_moves = self.possible_moves(coord)
                 for move in possible_moves:
                     if self[move] < 0:
@@ -187,7 +340,7 @@ class Board:
             
         # If defense assessment is enabled, when a piece is threatened
         if defense:
-            for coord in zip(*np.where(self.grid * self.turn < -10)):
+            for coord in [coord for color in (1, -1) for coord in self.pieces[color] if self[coord] * self.turn < -10]:
                 possible_moves = self.possible_moves(coord)
                 for move in possible_moves:
                     if self[move] > 0:
@@ -203,12 +356,58 @@ class Board:
         Returns:
             Board: New Board instance with the same layout and state.
         """
-        new_board                     = Board(self.grid.copy(), self.__moved.copy(), self.__max_best_piece_coord_table, self.__max_best_move_table, self.__max_eval_table, self.__min_best_piece_coord_table, self.__min_best_move_table, self.__min_eval_table, self.__threat, self.__defense) 
+        new_board                     = type(self)(self.grid.copy(), self._moved_grid(), self.tt, self.__threat, self.__defense, self.zobrist_key)
         new_board.turn                = self.turn
+        new_board.side                = self.side
         new_board.checkmate           = self.checkmate
         return new_board
 
 
+    def _state(self) -> tuple:
+        """
+        Serialize the position into a compact picklable tuple, to send it to another process.
+
+        Returns:
+            tuple: Board class, grid, moved flags, heuristics, Zobrist key, side to move, turn and search settings.
+        """
+        return (type(self), self.grid.copy(), self._moved_grid(), self.__threat, self.__defense,
+                self.zobrist_key, self.side, self.turn, self.null_move, self.quiescence_evasions)
+
+
+    @staticmethod
+    def _from_state(state: tuple, tt: TranspositionTable) -> "Board":
+        """
+        Rebuild a board serialized by _state().
+
+        Args:
+            state (tuple): Serialized position.
+            tt (TranspositionTable): Transposition table of the new board.
+
+        Returns:
+            Board: Board of the same class and position.
+        """
+        board_class, grid, moved, threat, defense, zobrist_key, side, turn, null_move, quiescence_evasions = state
+        board      = board_class(grid, moved, tt, threat, defense, zobrist_key)
+        board.side = side
+        board.turn = turn
+        board.null_move           = null_move
+        board.quiescence_evasions = quiescence_evasions
+        return board
+
+
+    def close(self) -> None:
+        """
+        Stop the helper processes of the parallel search and release the shared transposition table.
+
+        Returns:
+            None
+        """
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+        self.tt.close()
+
+
     def _is_check(self, color: int) -> bool:
         """
         Determine if the specified color is in check.
@@ -219,12 +418,10 @@ class Board:
         Returns:
             bool: True if color's king is in check, False otherwise.
         """
-        king_pos = np.where(self.grid * color == 900)
-        
-        for coord in zip(*np.where(self.grid * color < 0)):
-            if king_pos in MovePieces.possible_moves(self.grid, self.__moved, coord):
-                return True
-        return False
+        king = self.kings.get(color)
+        if king is None:
+            return False
+        return MovePieces.is_attacked(self.grid, king, -color)
     
 
     def is_checkmate(self, color: int) -> bool:
@@ -237,15 +434,48 @@ class Board:
         Returns:
             bool: True if color's king is in checkmate, False otherwise.
         """
-        for coord in zip(*np.where(self.grid * color < 0)):
-            for move in self.possible_moves(coord):
-                new_board = self._copy()
-                new_board.move(coord, move)
-                if not new_board._is_check(color):
-                    return False
-        return True
-    
+        return self._is_check(color) and not self.has_any_legal_move(color)
+
+
+    def has_any_legal_move(self, color: int) -> bool:
+        """
+        Determine if the specified color has at least one legal move, stopping at the first one found.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+
+        Returns:
+            bool: True if color can move, False if it is checkmated or stalemated.
+        """
+        return next(iter(self.iter_legal_moves(color)), None) is not None
     
+
+    def iter_legal_moves(self, color: int):
+        """
+        Generate lazily the legal moves of the specified color, to stop at the first one when possible.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+
+        Yields:
+            tuple: Legal move as (piece coordinates, move coordinates).
+        """
+        return MovePieces.legal_moves(self.grid, self.__moved, color, list(self.pieces[color]), self.kings.get(color))
+
+
+    def legal_moves(self, color: int) -> list:
+        """
+        Generate every legal move of the specified color.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+
+        Returns:
+            list: List of legal moves as (piece coordinates, move coordinates).
+        """
+        return list(self.iter_legal_moves(color))
+
+
     def possible_moves(self, piece_coord: tuple) -> list:
         """
         Generate legal moves for a piece at the given coordinates.
@@ -256,125 +486,726 @@ class Board:
         Returns:
             list: List of legal move coordinates.
         """
-        possible_moves_theo = MovePieces.possible_moves(self.grid, self.__moved, piece_coord)
-        possible_moves_real = []
-        for new_coord in possible_moves_theo:
-            board_virtual = self._copy()
-            board_virtual.move(piece_coord, new_coord)
-            if not board_virtual._is_check(np.sign(self[piece_coord])):
-                possible_moves_real.append(new_coord)
-        return possible_moves_real
+        color = 1 if self[piece_coord] > 0 else -1
+        return [move for _, move in MovePieces.legal_moves(self.grid, self.__moved, color, [piece_coord], self.kings.get(color))]
+
+
+    def _least_valuable_attacker(self, coord: tuple, color: int, removed: set) -> tuple:
+        """
+        Find the least valuable piece of a color attacking a square, ignoring the pieces that already
+        took part in the exchange. Sliding pieces behind a removed piece attack through it (x-rays).
+
+        Args:
+            coord (tuple): Coordinates of the square.
+            color (int): Color of the attacking pieces.
+            removed (set): Coordinates of the pieces already traded on the square.
+
+        Returns:
+            tuple: Coordinates of the attacker, or None if the square is not attacked.
+        """
+        x, y = coord
+        best, best_value = None, PieceValues.KING_WHITE.value + 1
+
+        for squares, kind in ((PAWN_ATTACKS[-color][x][y], PieceValues.PAWN_WHITE.value),
+                              (KNIGHT_ATTACKS[x][y], PieceValues.KNIGHT_WHITE.value),
+                              (KING_ATTACKS[x][y], PieceValues.KING_WHITE.value)):
+            if kind < best_value:
+                for square in squares:
+                    if self[square] == kind * color and square not in removed:
+                        best, best_value = square, kind
+                        break
+
+        # Sliding pieces: the first piece met along each ray, looking through the removed ones
+        queen = PieceValues.QUEEN_WHITE.value
+        for rays, slider in ((BISHOP_RAYS[x][y], PieceValues.BISHOP_WHITE.value), (ROOK_RAYS[x][y], PieceValues.ROOK_WHITE.value)):
+            for ray in rays:
+                for square in ray:
+                    piece = self[square]
+                    if piece == 0 or square in removed:
+                        continue
+                    value = piece * color
+                    if (value == slider or value == queen) and value < best_value:
+                        best, best_value = square, value
+                    break
+
+        return best
+
+
+    def see(self, coord: tuple, new_coord: tuple) -> int:
+        """
+        Static exchange evaluation: resolve the sequence of captures on the destination square, each
+        side recapturing with its least valuable attacker and stopping when continuing would lose material.
+        The board is only read, no move is made.
+
+        Args:
+            coord (tuple): Coordinates of the capturing piece.
+            new_coord (tuple): Coordinates of the captured piece.
+
+        Returns:
+            int: Material won by the side making the capture at the end of the exchange, in PieceValues units.
+        """
+        coord, new_coord = (int(coord[0]), int(coord[1])), (int(new_coord[0]), int(new_coord[1]))
+        color   = 1 if self[coord] > 0 else -1
+        removed = {coord}
+        gains   = [abs(int(self[new_coord]))] # gains[i]: material won by the side making the i-th capture
+        on_square = abs(int(self[coord])) # Value of the piece standing on the square after the last capture
+
+        side = -color
+        while True:
+            attacker = self._least_valuable_attacker(new_coord, side, removed)
+            if attacker is None:
+                break
+            gains.append(on_square - gains[-1])
+            removed.add(attacker)
+            on_square = abs(int(self[attacker]))
+            side = -side
+
+        # Each side may decline to recapture: fold the exchange back from the last capture
+        for i in range(len(gains) - 1, 0, -1):
+            gains[i - 1] = -max(-gains[i - 1], gains[i])
+        return gains[0]
 
 
     def score(self) -> float:
         """
-        Return the board evaluation score, using the transposition table for memoization.
+        Return the static evaluation of the board from White's point of view.
+        Checkmates and stalemates are not detected here: the search scores them when a node has no legal move.
 
         Returns:
             float: Board evaluation score.
         """
-        
-        if self.is_checkmate(self.turn):
-            score = 1e6
-        elif self.is_checkmate(-self.turn):
-            score = -1e6
-        else:
-            score = self._evaluate_board(threat=self.__threat, defense=self.__defense)
-
-        return score
+        return self._evaluate_board(threat=self.__threat, defense=self.__defense)
     
 
-    def move(self, coord: tuple, new_coord: tuple) -> None:
+    def make_null_move(self) -> None:
         """
-        Move a piece from the given coordinates to the new coordinates, updating the board state.
+        Pass the turn: only the side to move and its Zobrist key change, undone by unmake_null_move().
+
+        Returns:
+            None
+        """
+        self.zobrist_key ^= ZOBRIST_SIDE
+        self.side = -self.side
+
+
+    def unmake_null_move(self) -> None:
+        """
+        Undo the last make_null_move().
+
+        Returns:
+            None
+        """
+        self.zobrist_key ^= ZOBRIST_SIDE
+        self.side = -self.side
+
+
+    def _has_pieces(self, color: int) -> bool:
+        """
+        Check whether a color has pieces other than pawns and its king, null-move pruning being unsafe
+        in pawn endings where zugzwang is common.
+
+        Args:
+            color (int): Color of the pieces.
+
+        Returns:
+            bool: True if the color has at least a bishop, a knight, a rook or a queen.
+        """
+        return any(abs(self[coord]) not in (PieceValues.PAWN_WHITE.value, PieceValues.KING_WHITE.value)
+                   for coord in self.pieces[color])
+
+
+    def make_move(self, coord: tuple, new_coord: tuple) -> None:
+        """
+        Apply a move in place and push an undo record so that unmake_move() can restore the position.
 
         Args:
             coord (tuple): Current piece coordinates.
             new_coord (tuple): New piece coordinates.
-        
+
         Returns:
             None
         """
-        piece        = self[coord]
+        grid         = self.grid
+        moved        = self.__moved
         x, y         = coord
         new_x, new_y = new_coord
+        piece        = int(grid[x, y])
+        captured     = int(grid[new_x, new_y])
 
-        self[new_x, new_y] = self[x, y]
-        self[x, y] = 0
-        self.__moved[x, y] = True
-        self.__moved[new_x, new_y] = True
-
+        # Castling: the rook jumps over the king
+        rook_from, rook_to = None, None
         if abs(piece) == 900 and abs(new_x - x) == 2:
             if new_x > x:
-                self[new_x - 1, new_y] = self[new_x + 1, new_y]
-                self[new_x + 1, new_y] = 0
-                self.__moved[(new_x+1, new_y)] = True
+                rook_from, rook_to = (new_x + 1, new_y), (new_x - 1, new_y)
             else:
-                self[new_x + 1, new_y] = self[new_x - 2, new_y]
-                self[new_x - 2, new_y] = 0
-                self.__moved[(new_x-2, new_y)] = True
+                rook_from, rook_to = (new_x - 2, new_y), (new_x + 1, new_y)
+
+        # Piece lists: the moved piece keeps its slot, the captured piece leaves the opponent's list
+        color = 1 if piece > 0 else -1
+        own   = self.pieces[color]
+        own[own.index(coord)] = new_coord
+        captured_index = None
+        if captured != 0:
+            enemy = self.pieces[-color]
+            captured_index = enemy.index(new_coord)
+            del enemy[captured_index]
+        if abs(piece) == 900:
+            self.kings[color] = new_coord
+        if rook_from is not None and rook_from in own:
+            own[own.index(rook_from)] = rook_to
+
+        # Undo record: squares, moved piece, captured piece and its slot, moved flags, castling rook squares, Zobrist key and material
+        self.__undo_stack.append((coord, new_coord, piece, captured, captured_index, bool(moved[x, y]), bool(moved[new_x, new_y]),
+                                  rook_from, rook_to, rook_from is not None and bool(moved[rook_from]), self.zobrist_key, self.material))
 
+        # Zobrist update: moved piece out of its square, captured piece out, moved piece in, side to move,
+        # and the castling keys of the unmoved kings and rooks that move or are captured
+        key = self.zobrist_key ^ ZOBRIST_PIECES[piece][x][y] ^ ZOBRIST_SIDE
+        if abs(piece) in CASTLING_PIECES and not moved[x, y]:
+            key ^= ZOBRIST_CASTLING[x][y]
+        if captured != 0:
+            key ^= ZOBRIST_PIECES[captured][new_x][new_y]
+            self.material -= captured
+            if abs(captured) in CASTLING_PIECES and not moved[new_x, new_y]:
+                key ^= ZOBRIST_CASTLING[new_x][new_y]
+
+        grid[new_x, new_y] = piece
+        grid[x, y] = 0
+        moved[x, y] = True
+        moved[new_x, new_y] = True
+
+        if rook_from is not None:
+            rook = int(grid[rook_from])
+            if rook != 0:
+                key ^= ZOBRIST_PIECES[rook][rook_from[0]][new_y] ^ ZOBRIST_PIECES[rook][rook_to[0]][new_y]
+                if not moved[rook_from]:
+                    key ^= ZOBRIST_CASTLING[rook_from[0]][new_y]
+            grid[rook_to]    = rook
+            grid[rook_from]  = 0
+            moved[rook_from] = True
+
+        # Promotion to a queen
         if abs(piece) == 10:
-            if new_y == 0 and piece>0:
-                self[new_x, new_y] = 90
+            if new_y == 0 and piece > 0:
+                grid[new_x, new_y] = 90
+                piece = 90
+                self.material += 80
             elif new_y == 7 and piece < 0:
-                self[new_x, new_y] = -90
+                grid[new_x, new_y] = -90
+                piece = -90
+                self.material -= 80
+
+        self.zobrist_key = key ^ ZOBRIST_PIECES[piece][new_x][new_y]
+        self.side = -self.side
+
+
+    def unmake_move(self) -> None:
+        """
+        Restore the position as it was before the last make_move() call.
+
+        Returns:
+            None
+        """
+        coord, new_coord, piece, captured, captured_index, moved_from, moved_to, rook_from, rook_to, rook_moved, key, material = self.__undo_stack.pop()
+        grid  = self.grid
+        moved = self.__moved
+
+        color = 1 if piece > 0 else -1
+        own   = self.pieces[color]
+        own[own.index(new_coord)] = coord
+        if captured_index is not None:
+            self.pieces[-color].insert(captured_index, new_coord)
+        if abs(piece) == 900:
+            self.kings[color] = coord
+        if rook_from is not None and rook_to in own:
+            own[own.index(rook_to)] = rook_from
+
+        if rook_from is not None:
+            grid[rook_from]  = grid[rook_to]
+            grid[rook_to]    = 0
+            moved[rook_from] = rook_moved
+
+        grid[coord]      = piece
+        grid[new_coord]  = captured
+        moved[coord]     = moved_from
+        moved[new_coord] = moved_to
+        self.zobrist_key = key
+        self.material    = material
+        self.side        = -self.side
+
+
+    def move(self, coord: tuple, new_coord: tuple) -> None:
+        """
+        Move a piece from the given coordinates to the new coordinates, updating the board state.
+
+        Args:
+            coord (tuple): Current piece coordinates.
+            new_coord (tuple): New piece coordinates.
+        
+        Returns:
+            None
+        """
+        self.make_move((int(coord[0]), int(coord[1])), (int(new_coord[0]), int(new_coord[1])))
     
 
-    def minimax(self, depth: int, alpha: float, beta: float, maximizing: bool) -> tuple:
+
+    def minimax(self, depth: int, alpha: float = -np.inf, beta: float = np.inf) -> tuple:
         """
-        Minimax algorithm with alpha-beta pruning to find the best move for the current player.
+        Search the best move of the side to move, with scores from White's point of view.
 
         Args:
             depth (int): Maximum depth to search in the game tree.
-            alpha (float): Alpha value for pruning.
-            beta (float): Beta value for pruning.
-            maximizing (bool): True if maximizing player, False if minimizing.
+            alpha (float): Lower bound of the window, from White's point of view.
+            beta (float): Upper bound of the window, from White's point of view.
 
         Returns:
             tuple: Best piece coordinates, best move coordinates, and the evaluation score.
         """
-        if depth == 0 or self.is_checkmate(self.turn):
-            score = self.score()
-            return None, None, score  # No piece or move, just the evaluation (danger)
-        
-        hash_key = self._hash_state()
-        if self._memoized(maximizing, hash_key):
-            return self._get_memoized(maximizing, hash_key)
-        
+        color = self.side
+        if color > 0:
+            coord, move, eval = self.negamax(depth, alpha, beta)
+        else:
+            coord, move, eval = self.negamax(depth, -beta, -alpha)
+        return coord, move, eval * color
+
+
+    def negamax(self, depth: int, alpha: float, beta: float, ply: int = 0, allow_null: bool = True, extensions: int = 0) -> tuple:
+        """
+        Principal variation search in negamax form: scores are given from the point of view of the side
+        to move, and the score of a move is the opposite of the score of the position it leads to.
+        The first move is searched with the full window, the other ones with a null window that only
+        proves they are not better, and are searched again with the full window when the proof fails.
+
+        Args:
+            depth (int): Maximum depth to search in the game tree.
+            alpha (float): Score the side to move is already guaranteed.
+            beta (float): Score the opponent is already guaranteed, above which the node is cut off.
+            ply (int): Distance to the root of the search, used to index the killer moves.
+            allow_null (bool): False right after a null move, so that the turn is never passed twice in a row.
+            extensions (int): Number of check extensions already granted on the line leading to the node.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates, and the evaluation score for the side to move.
+        """
+        stats = self.stats
+        stats.nodes += 1
+        if stats.nodes % CHECK_EVERY == 0 and self._out_of_budget():
+            raise SearchTimeout()
+
+        if depth <= 0 or ply >= MAX_PLY:
+            return None, None, self.quiescence(alpha, beta, ply)  # No piece or move, just the evaluation (danger)
+
+        # Mate-distance pruning: no line from here can beat a mate found closer to the root
+        if ply > 0:
+            alpha = max(alpha, -MATE_SCORE + ply)
+            beta = min(beta, MATE_SCORE - ply - 1)
+            if alpha >= beta:
+                return None, None, alpha
+
+        # Scores are stored from the point of view of the side to move, which the key already encodes
+        hash_key = self.zobrist_key
+        entry = self.tt.probe(hash_key)
+        tt_move = None
+        if entry is not None:
+            tt_move, tt_score, tt_depth, tt_bound = entry
+            tt_score = score_from_tt(tt_score, ply)
+            # No cutoff at the root, whose move must come from the legal moves searched below
+            if ply > 0 and tt_depth >= depth and tt_move is not None:
+                if tt_bound == EXACT:
+                    return tt_move[0], tt_move[1], tt_score
+                elif tt_bound == LOWER:
+                    alpha = max(alpha, tt_score)
+                elif tt_bound == UPPER:
+                    beta = min(beta, tt_score)
+                if beta <= alpha:
+                    return tt_move[0], tt_move[1], tt_score
+
+        alpha_orig = alpha
+        color = self.side
+        in_check = self._is_check(color)
+
+        # Null-move pruning: if the opponent cannot reach the window even when given a free move,
+        # a reduced null-window search is enough to cut the node off
+        if (self.null_move and allow_null and ply > 0 and depth > NULL_MOVE_R and not in_check
+                and self._has_pieces(color) and self.score() * color >= beta):
+            reduction = NULL_MOVE_DEEP_R if depth >= NULL_MOVE_DEEP else NULL_MOVE_R
+            stats.null_tries += 1
+            self.make_null_move()
+            try:
+                _, _, eval = self.negamax(depth - 1 - reduction, -beta, -beta + 1, ply + 1, False)
+            finally:
+                self.unmake_null_move()
+            if -eval >= beta:
+                stats.null_cutoffs += 1
+                return None, None, beta
+
+        moves = self.legal_moves(color)
+
+        # No legal move: checkmate if the king is attacked, stalemate otherwise
+        if not moves:
+            return None, None, -MATE_SCORE + ply if in_check else 0
+        moves = self.ordering.order(self, moves, color, ply, tt_move)
+        if ply == 0 and self.root_rotation and len(moves) > 2:
+            shift = self.root_rotation % (len(moves) - 1)
+            moves = moves[:1] + moves[1 + shift:] + moves[1:1 + shift]
+
         best_move = None
         best_piece_coord = None
-        if maximizing:
-            max_eval = -np.inf
-            for coord in zip(*np.where(self.grid > 0)):  # assuming positive values for maximizing player
-                for move in self.possible_moves(coord):
-                    new_board = self._copy()  # clone the board before applying the move
-                    new_board.move(coord, move)  
-                    _, _, eval = new_board.minimax(depth - 1, alpha, beta, False)
-                    if eval > max_eval:
-                        best_piece_coord = coord
-                        best_move        = move
-                        max_eval         = eval
-                        self._fill_tables(False, hash_key, coord, move, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        break  # Beta cutoff
-            return best_piece_coord, best_move, max_eval  # Return the best piece, its move, and the danger score
+        best_eval = -np.inf
+        split = False
+        for index, (coord, move) in enumerate(moves):
+            if index == 1 and self.splitter is not None and self.splitter.can_split(depth):
+                # Young brothers wait: once the first move is searched, the others are shared with the idle helpers
+                result = self.splitter.split(self, moves[1:], depth, alpha, beta, ply, extensions)
+                if result is None:
+                    raise SearchTimeout()
+                coord, move, eval = result
+                split = True
+            else:
+                quiet = not in_check and self[move] == 0 and not self._is_promotion(coord, move)
+                self.make_move(coord, move)  # apply the move in place, undone right after the search
+                try:
+                    # Check extension: a move giving check is searched one ply deeper, up to MAX_EXTENSIONS times on a line
+                    gives_check = self._is_check(-color)
+                    quiet = quiet and not gives_check
+                    extension = 1 if gives_check and extensions < MAX_EXTENSIONS else 0
+                    new_depth = depth - 1 + extension
+                    extensions_child = extensions + extension
+
+                    # Late move pruning: at low depth, late quiet moves are skipped once a move has been searched,
+                    # except at the root, where every move must be searched
+                    if (quiet and ply > 0 and depth < len(LMP_COUNTS) and index >= LMP_COUNTS[depth]
+                            and abs(best_eval) < MATE_BOUND):
+                        stats.pruned += 1
+                        continue
+
+                    if index == 0:
+                        _, _, eval = self.negamax(new_depth, -beta, -alpha, ply + 1, True, extensions_child)
+                        eval = -eval
+                    else:
+                        # Late move reductions: late quiet moves are searched less deeply, and again at full depth if they beat alpha
+                        reduction = 0
+                        if quiet and depth >= LMR_MIN_DEPTH and index >= LMR_MIN_MOVES:
+                            reduction = min(LMR_TABLE[min(depth, 63)][min(index, 63)], depth - 2)
+                        _, _, eval = self.negamax(new_depth - reduction, -alpha - 1, -alpha, ply + 1, True, extensions_child)
+                        eval = -eval
+                        if reduction > 0:
+                            stats.reductions += 1
+                            if eval > alpha:
+                                stats.researches += 1
+                                _, _, eval = self.negamax(new_depth, -alpha - 1, -alpha, ply + 1, True, extensions_child)
+                                eval = -eval
+
+                        # The null window only proves the move is not better: search it again to get its score
+                        if alpha < eval < beta:
+                            stats.pvs_researches += 1
+                            _, _, eval = self.negamax(new_depth, -beta, -alpha, ply + 1, True, extensions_child)
+                            eval = -eval
+                finally:
+                    self.unmake_move()  # also restores the board when the search is interrupted
+
+            if eval > best_eval:
+                best_piece_coord = coord
+                best_move        = move
+                best_eval        = eval
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                stats.cutoffs += 1
+                stats.first_move_cutoffs += index == 0
+                self.ordering.update(self, coord, move, color, ply, depth)
+                break  # The opponent will avoid this position
+            if split:
+                break  # The younger moves were all searched at the split point
+
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(hash_key, (best_piece_coord, best_move) if best_move is not None else None, score_to_tt(best_eval, ply), depth, bound)
+        return best_piece_coord, best_move, best_eval  # Return the best piece, its move, and the danger score
+
+
+    def quiescence(self, alpha: float, beta: float, ply: int = 0) -> float:
+        """
+        Capture-only search run at the leaves of negamax, so that positions are only evaluated once the
+        exchanges in progress are resolved. The side to move may stand pat on the static evaluation,
+        and captures that cannot bring the score back into the window are skipped (delta pruning).
+
+        Args:
+            alpha (float): Score the side to move is already guaranteed.
+            beta (float): Score above which the node is cut off.
+            ply (int): Distance to the root of the search.
+
+        Returns:
+            float: Evaluation score of the quiet position reached, for the side to move.
+        """
+        stats = self.stats
+        stats.qnodes += 1
+        if stats.qnodes % CHECK_EVERY == 0 and self._out_of_budget():
+            raise SearchTimeout()
+
+        color = self.side
+
+        # In check, standing pat is not an option: every evasion is searched
+        if self.quiescence_evasions and self._is_check(color):
+            moves = self.legal_moves(color)
+            if not moves:
+                return -MATE_SCORE + ply
+            best_eval = -np.inf
+            stand_pat = None
         else:
-            min_eval = np.inf
-            for coord in zip(*np.where(self.grid < 0)):  # assuming negative values for minimizing player
-                for move in self.possible_moves(coord):
-                    new_board = self._copy()  # clone the board before applying the move
-                    new_board.move(coord, move)
-                    _, _, eval = new_board.minimax(depth - 1, alpha, beta, True)
-                    if eval < min_eval:
-                        best_piece_coord = coord
-                        best_move        = move
-                        min_eval         = eval
-                        self._fill_tables(True, hash_key, coord, move, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        break  # Alpha cutoff
-            return best_piece_coord, best_move, min_eval  # Return the best piece, its move, and the danger score
+            stand_pat = best_eval = self.score() * color
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            # Captures losing material by static exchange evaluation are not searched
+            moves = [(coord, move) for coord, move in self.iter_legal_moves(color)
+                     if self._is_promotion(coord, move)
+                     or (self[move] != 0 and (abs(self[move]) >= abs(self[coord]) or self.see(coord, move) >= 0))]
+
+        # The captures kept when not in check already passed the exchange evaluation
+        for coord, move in self.ordering.order(self, moves, color, ply, see=stand_pat is None):
+            # Delta pruning: even winning the captured piece for free leaves the score below alpha
+            if stand_pat is not None:
+                gain = abs(self[move]) + DELTA_MARGIN + (PROMOTION_GAIN if self._is_promotion(coord, move) else 0)
+                if stand_pat + gain <= alpha:
+                    continue
+
+            self.make_move(coord, move)
+            try:
+                eval = -self.quiescence(-beta, -alpha, ply + 1)
+            finally:
+                self.unmake_move()
+            best_eval = max(best_eval, eval)
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                break
+
+        return best_eval
+
+
+    def _is_promotion(self, coord: tuple, move: tuple) -> bool:
+        """
+        Check whether a move promotes a pawn.
+
+        Args:
+            coord (tuple): Current piece coordinates.
+            move (tuple): New piece coordinates.
+
+        Returns:
+            bool: True if a pawn reaches the last rank.
+        """
+        return abs(self[coord]) == PieceValues.PAWN_WHITE.value and move[1] in (0, 7)
+
+
+    def _out_of_budget(self) -> bool:
+        """
+        Check the time and node budgets of the current search.
+
+        Returns:
+            bool: True if the search must stop.
+        """
+        if self.__stop is not None and self.__stop.is_set():
+            return True
+        # Quiescence nodes count towards the budget, as in the node counts reported by the search
+        if self.__node_limit is not None and self.stats.nodes + self.stats.qnodes >= self.__node_limit:
+            return True
+        return self.__deadline is not None and perf_counter() >= self.__deadline
+
+
+    def _aspiration(self, depth: int, previous: float) -> tuple:
+        """
+        Search the root in a narrow window centred on the score of the previous iteration, which cuts
+        more nodes than the full window. When the score falls outside, the window is widened on that
+        side, doubling its width each time, and the root is searched again.
+
+        Args:
+            depth (int): Depth of the iteration.
+            previous (float): Score of the previous iteration, from White's point of view.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates, and the evaluation score.
+        """
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous - delta, previous + delta
+        while True:
+            result = self.minimax(depth, alpha, beta)
+            eval = result[2]
+            if eval <= alpha:
+                self.stats.fail_lows += 1
+                alpha = eval - delta if delta < MATE_SCORE else -np.inf
+            elif eval >= beta:
+                self.stats.fail_highs += 1
+                beta = eval + delta if delta < MATE_SCORE else np.inf
+            else:
+                return result
+            delta *= 2
+
+
+    def search(self, time_ms: float = None, nodes: int = None, max_depth: int = 64, threads: int = 1, parallel: str = "smp",
+               age: bool = True) -> tuple:
+        """
+        Iterative deepening on top of minimax for the side to move: search at depth 1, 2, ... until the
+        time or node budget is exhausted, reusing the transposition table between iterations.
+        The first iteration always completes so that a move is always returned.
+
+        With several threads, the search runs on several processes, with one of PARALLEL_SEARCHES:
+        "smp" makes helper processes search the same position at the same time (Lazy SMP), sharing
+        the transposition table, which must then be allocated in shared memory. "root" splits the
+        moves of the root between the processes of a pool. "ybwc" shares the moves of any node deep enough
+        with the helper processes once its first move has been searched, also with a shared table.
 
+        Args:
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, counting quiescence nodes, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+            threads (int): Number of processes searching, including this one.
+            parallel (str): Parallel search used with several threads, one of PARALLEL_SEARCHES.
+            age (bool): Age the killer and history tables first, False when they were already aged for this move.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the last completed iteration.
+        """
+        self.stats = SearchStats()
+        self.tt.new_search()
+        if age:
+            self.ordering.age()
+        if threads <= 1:
+            return self._iterative_deepening(time_ms, nodes, max_depth)
+
+        parallel_class = PARALLEL_SEARCHES[parallel]
+        if type(self.parallel) is not parallel_class or self.parallel.threads != threads:
+            if self.parallel is not None:
+                self.parallel.close()
+            self.parallel = parallel_class(threads, self.tt)
+        return self.parallel.search(self, time_ms, nodes, max_depth)
+
+
+    def _iterative_deepening(self, time_ms: float, nodes: int, max_depth: int, start_depth: int = 1,
+                             root_search: Callable = None, split_depth: int = 0) -> tuple:
+        """
+        Run the iterations of search(), the statistics and tables being already set up.
+
+        Args:
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+            start_depth (int): Depth of the first iteration.
+            root_search (Callable): Function searching the root at a given depth in place of minimax, used by the
+                parallel searches. It returns the same tuple as minimax, or None when the budget is exhausted.
+            split_depth (int): Depth from which root_search is used.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the last completed iteration.
+        """
+        start = perf_counter()
+        best = None, None, self.score()
+
+        try:
+            for depth in range(start_depth, max_depth + 1):
+                # The budgets only apply once the first iteration has produced a move
+                if depth == start_depth + 1:
+                    self._set_limits(start + time_ms / 1000 if time_ms is not None else None, nodes, self.stop)
+                try:
+                    if root_search is not None and depth >= split_depth:
+                        result = root_search(depth)
+                        if result is None:
+                            break
+                        best = result
+                    elif depth >= ASPIRATION_DEPTH and best[0] is not None and abs(best[2]) < MATE_BOUND:
+                        best = self._aspiration(depth, best[2])
+                    else:
+                        best = self.minimax(depth)
+                except SearchTimeout:
+                    break
+
+                self.stats.depth = depth
+                self.stats.best_move = best[:2] if best[0] is not None else None
+                self.stats.score = best[2]
+                if best[0] is None or abs(best[2]) >= MATE_BOUND or self._out_of_budget():
+                    break  # No legal move, forced mate found or budget exhausted
+        finally:
+            self._set_limits(None, None, None)
+            self.stats.elapsed = perf_counter() - start
+
+        return best
+
+
+    def _set_limits(self, deadline: float, node_limit: int, stop) -> None:
+        """
+        Set the limits checked by _out_of_budget() during the search.
+
+        Args:
+            deadline (float): perf_counter() value at which the search must stop, or None.
+            node_limit (int): Number of nodes, quiescence nodes included, after which the search must stop, or None.
+            stop (Event): Event stopping the search when set, or None.
+
+        Returns:
+            None
+        """
+        self.__deadline   = deadline
+        self.__node_limit = node_limit
+        self.__stop       = stop
+
+
+    def _search_root_move(self, coord: tuple, move: tuple, depth: int, alpha: float) -> float:
+        """
+        Search one move of the root for the side to move, used by the root-splitting parallel search.
+
+        Args:
+            coord (tuple): Coordinates of the moved piece.
+            move (tuple): Coordinates of the destination square.
+            depth (int): Depth of the root.
+            alpha (float): Score of the best root move known, from the point of view of the side to move.
+
+        Returns:
+            float: Score of the move for the side to move, an upper bound if it is not above alpha,
+            or None if the search was stopped.
+        """
+        self.make_move(coord, move)
+        try:
+            # Check extension, as in negamax, no extension being granted yet at the root
+            extension = 1 if MAX_EXTENSIONS > 0 and self._is_check(self.side) else 0
+            _, _, eval = self.negamax(depth - 1 + extension, -np.inf, -alpha, 1, True, extension)
+        except SearchTimeout:
+            return None
+        finally:
+            self.unmake_move()
+        return -eval
+
+
+    def _search_split_move(self, coord: tuple, move: tuple, depth: int, alpha: float, beta: float, ply: int, extensions: int) -> float:
+        """
+        Search one of the younger moves of a split point of the YBWC search, with a null window first
+        as in negamax, then with the full window if it beats alpha.
+
+        Args:
+            coord (tuple): Coordinates of the moved piece.
+            move (tuple): Coordinates of the destination square.
+            depth (int): Remaining depth of the split point.
+            alpha (float): Best score of the split point known, from the point of view of the side to move.
+            beta (float): Score above which the split point is cut off.
+            ply (int): Distance of the split point to the root of the search.
+            extensions (int): Check extensions already granted on the line.
+
+        Returns:
+            float: Score of the move for the side to move, an upper bound if it is not above alpha,
+            or None if the search was stopped.
+        """
+        self.make_move(coord, move)
+        try:
+            extension = 1 if extensions < MAX_EXTENSIONS and self._is_check(self.side) else 0
+            _, _, eval = self.negamax(depth - 1 + extension, -alpha - 1, -alpha, ply + 1, True, extensions + extension)
+            eval = -eval
+            if alpha < eval < beta:
+                self.stats.pvs_researches += 1
+                _, _, eval = self.negamax(depth - 1 + extension, -beta, -alpha, ply + 1, True, extensions + extension)
+                eval = -eval
+        except SearchTimeout:
+            return None
+        finally:
+            self.unmake_move()
+        return eval
 
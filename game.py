@@ -1,40 +1,81 @@
 import pygame
-import numpy as np
 from board_ia import Board
+from bitboard import BitBoard
+from mailbox_board import MailboxBoard
+from transposition import TranspositionTable
 from screen import Screen, MARGIN, SIZE
+from ai_worker import SearchWorker, Ponder
 
 
 pygame.init()
 
+# Board representations the AI can run on
+BACKENDS = {"numpy": Board, "bitboard": BitBoard, "mailbox": MailboxBoard}
 
-def game(depth: int=3, threat: bool = False, defense: bool = False) -> None:
+# Frames per second of the game loop, which leaves the rest of the time to the AI search running in the background
+FPS = 30
+
+# Title of the window when the AI is not thinking
+CAPTION = "Memoized Minimax Chess"
+
+
+def game(depth: int=3, threat: bool = False, defense: bool = False, hash_size: int = 64, backend: str = "numpy",
+         move_time: float = None, null_move: bool = True, threads: int = 1, parallel: str = "smp",
+         ponder: bool = False) -> None:
     """
     Launch the game with the specified depth for the minimax algorithm. I personnally recommand a depth of 3.
 
     Args:
         depth (int): The depth of the minimax algorithm
+        threat (bool): Enable the threat heuristic
+        defense (bool): Enable the defense heuristic
+        hash_size (int): Size of the transposition table in megabytes
+        backend (str): Board representation, one of BACKENDS
+        move_time (float): Time budget of the AI per move in milliseconds, the search stops at depth if None
+        null_move (bool): Enable null-move pruning
+        threads (int): Number of processes searching the AI moves
+        parallel (str): Parallel search used with several threads, "smp", "root" or "ybwc"
+        ponder (bool): Search in the background during the human's turn
     
     Returns:
         None
     """
     # Initialize game variables
     running = True
+    stalemate = False
     turn = 1  # 1 for white, -1 for black
 
-    main_board = Board(threat=threat, defense=defense)
+    # The transposition table is shared with the helper processes of the Lazy SMP and YBWC searches
+    tt = TranspositionTable(hash_size, shared=threads > 1 and parallel in ("smp", "ybwc"))
+    main_board = BACKENDS[backend](tt=tt, threat=threat, defense=defense)
+    main_board.null_move = null_move
     screen = Screen()
+    pygame.display.set_caption(CAPTION)
+    clock = pygame.time.Clock()
+    worker = None # Background search of the AI move, while the AI is thinking
+    shown_board = main_board # Board displayed, a copy of the position while the AI searches the main board in place
+    pondering = None # Background search during the human's turn
+    ai_result = None # Move of the AI found by pondering, played without searching
 
     # Game loop
     while running and main_board.turn <= 150 and abs(main_board.checkmate) <= 3:
 
+        # Ponder on the human's turn, until the human plays
+        if ponder and running and turn == 1 and pondering is None:
+            pondering = Ponder(main_board)
+
         # Update the board display
-        screen.update(main_board)
+        screen.update(shown_board)
         
         for event in pygame.event.get():
 
             if event.type == pygame.QUIT:
                 running = False
 
+            # Space bar: the AI plays the best move of its last completed iteration
+            if worker is not None and event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                worker.move_now()
+
             if turn == 1 and event.type == pygame.MOUSEBUTTONDOWN:  # Player's turn
                 x1, y1 = event.pos
                 x1, y1 = (x1 - MARGIN) // SIZE, (y1 - MARGIN) // SIZE  # Convert mouse click to board coordinates
@@ -64,6 +105,10 @@ def game(depth: int=3, threat: bool = False, defense: bool = False) -> None:
 
                                     # Update the board with the move
                                     main_board.move((x1, y1), (x2, y2))
+                                    if pondering is not None:
+                                        ai_result = pondering.stop((x1, y1), (x2, y2), depth, move_time)
+                                        if ai_result is not None:
+                                            print("Ponder hit")
                                     click = True
 
                                     main_board.turn += 1
@@ -80,17 +125,40 @@ def game(depth: int=3, threat: bool = False, defense: bool = False) -> None:
                 else:
                     print("Not your pieces")
 
-                if main_board.is_checkmate(-turn):
-                    print("Checkmate!")
-                    main_board.checkmate = 5
-
-            # AI Turn
-            elif turn == -1:
+                if not main_board.has_any_legal_move(turn):
+                    if main_board.is_checkmate(turn):
+                        print("Checkmate!")
+                        main_board.checkmate = 5 * turn
+                    else:
+                        print("Stalemate!")
+                        stalemate = True
+                        running = False
+
+        # AI Turn: the search runs in the background, the loop polls it while the window keeps responding
+        if running and turn == -1:
+            if worker is None and ai_result is None:
                 print("Calculating optimal move...")
-                coord_piece_ai, new_position, danger = main_board.minimax(depth, -np.inf, np.inf, depth%2==0)
+                shown_board = main_board._copy()
+                worker = SearchWorker(main_board, time_ms=move_time, max_depth=depth, threads=threads, parallel=parallel)
+
+            elif worker is not None and not worker.done():
+                searched_depth, nodes, elapsed, left = worker.progress()
+                eta = f", {left:.1f}s left" if left is not None else f" of {depth}"
+                pygame.display.set_caption(f"AI thinking: depth {searched_depth}{eta}, {nodes} nodes in {elapsed:.1f}s (space: move now)")
+
+            else:
+                if worker is not None:
+                    coord_piece_ai, new_position, danger = worker.result()
+                    print(f"Search: {main_board.stats}")
+                else:
+                    coord_piece_ai, new_position, danger = ai_result
+                    print(f"Ponder: {pondering.board.stats}")
+                worker = ai_result = pondering = None
+                shown_board = main_board
+                pygame.display.set_caption(CAPTION)
                 print(f"AI moves {coord_piece_ai} to {new_position} with danger {danger}")
 
-                if danger == np.inf:
+                if coord_piece_ai is None:
                     main_board.checkmate = -5
                 else:
                     main_board.move(coord_piece_ai, new_position)
@@ -101,22 +169,37 @@ def game(depth: int=3, threat: bool = False, defense: bool = False) -> None:
                 main_board.checkmate = 0
                 turn *= -1  # Switch turns
 
-                if main_board.is_checkmate(-turn):
-                    print("Checkmate!")
-                    main_board.checkmate = -5
+                if not main_board.has_any_legal_move(turn):
+                    if main_board.is_checkmate(turn):
+                        print("Checkmate!")
+                        main_board.checkmate = 5 * turn
+                    else:
+                        print("Stalemate!")
+                        stalemate = True
+                        running = False
 
         pygame.display.flip()
+        clock.tick(FPS)
+
+    # The game ended while the AI was thinking or pondering
+    if worker is not None:
+        worker.cancel()
+    if pondering is not None:
+        pondering.cancel()
 
     # End of game: Determine winner
     total_score = main_board.score()
 
-    if main_board.checkmate <= -3 or total_score > 0:
+    if stalemate:
+        print("Draw")
+    elif main_board.checkmate <= -3 or total_score > 0:
         print(f"White wins on turn {main_board.turn}")
     elif main_board.checkmate >= 3 or total_score < 0:
         print(f"Black wins on turn {main_board.turn}")
     else:
         print("Draw")
 
+    main_board.close()
     pygame.quit()
 
 
@@ -124,10 +207,17 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Play a game of chess against the AI")
-    parser.add_argument("--depth", type=int, default=3, help="Depth of the minimax algorithm (default: 3)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum depth of the minimax algorithm (default: 3)")
     parser.add_argument("--threat", action="store_true", help="Enable threat heuristic (default: False)")
     parser.add_argument("--defense", action="store_true", help="Enable mobility heuristic (default: False)")
+    parser.add_argument("--hash", type=int, default=64, help="Size of the transposition table in MB (default: 64)")
+    parser.add_argument("--backend", choices=BACKENDS, default="numpy", help="Board representation (default: numpy)")
+    parser.add_argument("--time", type=float, default=None, help="Time budget of the AI per move in ms (default: none)")
+    parser.add_argument("--threads", type=int, default=1, help="Number of processes searching the AI moves (default: 1)")
+    parser.add_argument("--parallel", choices=["smp", "root", "ybwc"], default="smp", help="Parallel search used with several threads (default: smp)")
+    parser.add_argument("--ponder", action="store_true", help="Search in the background during the human's turn (default: False)")
+    parser.add_argument("--null-move", action=argparse.BooleanOptionalAction, default=True, help="Enable null-move pruning (default: True)")
 
     args = parser.parse_args()
 
-    game(args.depth, args.threat, args.defense)
\ No newline at end of file
+    game(args.depth, args.threat, args.defense, args.hash, args.backend, args.time, args.null_move, args.threads, args.parallel, args.ponder)
\ No newline at end of file
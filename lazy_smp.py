@@ -0,0 +1,140 @@
+import multiprocessing
+import queue
+from transposition import TranspositionTable
+
+
+def _helper(index: int, tt_size: int, tt_name: str, tasks, results, stop) -> None:
+    """
+    Loop of a helper process: search each position received until the main process raises the stop event.
+    Each helper starts 0 to 2 iterations deeper than the main process and searches the root moves after the
+    first in an order rotated by its index, so that no two processes search the same tree at the same time.
+
+    Args:
+        index (int): Number of the helper, from 1.
+        tt_size (int): Size of the shared transposition table in megabytes.
+        tt_name (str): Name of the shared memory block of the transposition table.
+        tasks (Queue): Positions to search, as (serialized board, maximum depth, table generation), None to quit.
+        results (Queue): Results sent back, as (index, completed depth, best move and score, nodes, quiescence nodes).
+        stop (Event): Event raised by the main process when its own search is over.
+
+    Returns:
+        None
+    """
+    tt = TranspositionTable(tt_size, name=tt_name)
+    ordering = None # Killer and history tables, kept warm between the searches of the game
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        state, max_depth, generation = task
+
+        board = state[0]._from_state(state, tt)
+        if ordering is not None:
+            ordering.age()
+            board.ordering = ordering
+        ordering            = board.ordering
+        board.stop          = stop
+        board.root_rotation = index
+        tt.generation       = generation
+
+        result = board._iterative_deepening(None, None, max_depth, 1 + index % 3)
+        results.put((index, board.stats.depth, result, board.stats.nodes, board.stats.qnodes))
+    tt.close()
+
+
+class LazySMP:
+    """
+    Lazy SMP parallel search: helper processes search the same position as the main process, without
+    any other coordination than the transposition table they share. Entries found by one process
+    cut the trees of the others, and the deepest completed search gives the move.
+    """
+
+    def __init__(self, threads: int, tt: TranspositionTable) -> None:
+        """
+        Start the helper processes, which stay alive between searches.
+
+        Args:
+            threads (int): Number of processes searching, including the main one.
+            tt (TranspositionTable): Transposition table in shared memory.
+        """
+        if tt.shm is None:
+            raise ValueError("Lazy SMP needs a transposition table in shared memory, create it with shared=True")
+
+        self.threads = threads
+        self.stop    = multiprocessing.Event()
+        self.results = multiprocessing.Queue()
+        self.tasks   = [multiprocessing.Queue() for _ in range(threads - 1)]
+        self.helpers = [multiprocessing.Process(target=_helper, args=(index + 1, tt.size_mb, tt.shm.name, tasks, self.results, self.stop), daemon=True)
+                        for index, tasks in enumerate(self.tasks)]
+        for helper in self.helpers:
+            helper.start()
+
+
+    def search(self, board, time_ms: float, nodes: int, max_depth: int) -> tuple:
+        """
+        Search a position with every process, see Board.search for the arguments.
+
+        Args:
+            board (Board): Board of the main process, its statistics and tables being already set up.
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget of the main process, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the deepest completed iteration.
+        """
+        self.stop.clear()
+        state = board._state()
+        for tasks in self.tasks:
+            tasks.put((state, max_depth, board.tt.generation))
+
+        try:
+            best = board._iterative_deepening(time_ms, nodes, max_depth)
+        finally:
+            self.stop.set()
+            helper_results = self.__collect()
+
+        stats = board.stats
+        for _, depth, result, helper_nodes, helper_qnodes in helper_results:
+            stats.nodes  += helper_nodes
+            stats.qnodes += helper_qnodes
+            if depth > stats.depth and result[0] is not None:
+                best        = result
+                stats.depth = depth
+        stats.best_move = best[:2] if best[0] is not None else None
+        stats.score     = best[2]
+        stats.threads   = self.threads
+        return best
+
+
+    def __collect(self) -> list:
+        """
+        Wait for the result of every helper.
+
+        Returns:
+            list: Results of the helpers.
+        """
+        results = []
+        while len(results) < len(self.helpers):
+            try:
+                results.append(self.results.get(timeout=0.1))
+            except queue.Empty:
+                if not all(helper.is_alive() for helper in self.helpers):
+                    raise RuntimeError("A helper process of the parallel search died")
+        return results
+
+
+    def close(self) -> None:
+        """
+        Stop the helper processes.
+
+        Returns:
+            None
+        """
+        self.stop.set()
+        for tasks in self.tasks:
+            tasks.put(None)
+        for helper in self.helpers:
+            helper.join(timeout=1)
+            if helper.is_alive():
+                helper.terminate()
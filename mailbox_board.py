@@ -0,0 +1,487 @@
+from array import array
+import numpy as np
+from numpy.typing import ArrayLike
+from board_ia import Board, INITIAL_PIECES
+from piece import PieceValues
+from transposition import TranspositionTable
+from zobrist import ZOBRIST_PIECES, ZOBRIST_SIDE, ZOBRIST_CASTLING, CASTLING_PIECES, square_key
+
+# 10x12 mailbox: the 8x8 board surrounded by sentinel squares (two rows above and below, one column on each side),
+# so that any step of a piece from a board square lands either on the board or on a sentinel
+OFF   = 99 # Sentinel code of the squares outside the board
+EMPTY = 0
+
+# Piece codes stored in the signed byte array, positive for White and negative for Black
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+CODE_TO_VALUE = {
+    0: 0,
+    PAWN: PieceValues.PAWN_WHITE.value, -PAWN: PieceValues.PAWN_BLACK.value,
+    KNIGHT: PieceValues.KNIGHT_WHITE.value, -KNIGHT: PieceValues.KNIGHT_BLACK.value,
+    BISHOP: PieceValues.BISHOP_WHITE.value, -BISHOP: PieceValues.BISHOP_BLACK.value,
+    ROOK: PieceValues.ROOK_WHITE.value, -ROOK: PieceValues.ROOK_BLACK.value,
+    QUEEN: PieceValues.QUEEN_WHITE.value, -QUEEN: PieceValues.QUEEN_BLACK.value,
+    KING: PieceValues.KING_WHITE.value, -KING: PieceValues.KING_BLACK.value,
+}
+VALUE_TO_CODE = {value: code for code, value in CODE_TO_VALUE.items()}
+
+# Conversions between (x, y) coordinates and mailbox indices
+MAILBOX     = [[(y + 2) * 10 + x + 1 for y in range(8)] for x in range(8)] # MAILBOX[x][y]
+COORDS      = [None] * 120
+for _x in range(8):
+    for _y in range(8):
+        COORDS[MAILBOX[_x][_y]] = (_x, _y)
+
+# Steps in the mailbox, White pawns go up the board (toward lower indices)
+UP, DOWN, LEFT, RIGHT = -10, 10, -1, 1
+KNIGHT_STEPS = (-21, -19, -12, -8, 8, 12, 19, 21)
+KING_STEPS   = (-11, -10, -9, -1, 1, 9, 10, 11)
+ROOK_STEPS   = (-10, -1, 1, 10)
+BISHOP_STEPS = (-11, -9, 9, 11)
+SLIDER_STEPS = {BISHOP: BISHOP_STEPS, ROOK: ROOK_STEPS, QUEEN: ROOK_STEPS + BISHOP_STEPS}
+
+
+class MailboxBoard(Board):
+    """
+    Board backend storing the position in a 120-byte mailbox with sentinel border squares.
+    Pieces walk offset lists over the buffer, so a bounds check is a single lookup,
+    while the search, the evaluation and the transposition table are inherited from Board.
+    """
+    def __init__(self, initial_pieces: ArrayLike = INITIAL_PIECES, moved: ArrayLike=[], tt: TranspositionTable = None, threat: bool = False, defense: bool = False, zobrist_key: int = None) -> None:
+        """
+        Initialize the board, see Board for the arguments.
+        """
+        super().__init__(initial_pieces, moved, tt, threat, defense, zobrist_key)
+        self.__undo_stack = [] # Undo records pushed by make_move() and popped by unmake_move()
+
+
+    def _set_position(self, grid: ArrayLike, moved: ArrayLike) -> None:
+        """
+        Fill the mailbox from a piece layout and the moved pieces.
+
+        Args:
+            grid (np.array): 2D array representing the piece layout.
+            moved (np.array): 2D array tracking moved pieces for castling and pawn promotions.
+        """
+        self.__cells = array("b", [OFF] * 120)
+        self.__moved = bytearray([1] * 120) # Sentinels count as moved so that castling never looks past the board
+        self.__piece_cells = {1: [], -1: []} # Mailbox indices of the pieces of each color
+        self.__king_cells  = {}
+        for x in range(8):
+            for y in range(8):
+                cell = MAILBOX[x][y]
+                code = VALUE_TO_CODE[int(grid[x, y])]
+                self.__cells[cell] = code
+                self.__moved[cell] = bool(moved[x, y])
+                if code != EMPTY:
+                    color = 1 if code > 0 else -1
+                    self.__piece_cells[color].append(cell)
+                    if abs(code) == KING:
+                        self.__king_cells[color] = cell
+
+
+    @property
+    def grid(self) -> ArrayLike:
+        """
+        2D array of the piece layout indexed by [x, y], built on demand for display and evaluation.
+
+        Returns:
+            np.array: Piece layout.
+        """
+        cells = self.__cells
+        return np.array([[CODE_TO_VALUE[cells[MAILBOX[x][y]]] for y in range(8)] for x in range(8)], dtype=np.int64)
+
+
+    @property
+    def pieces(self) -> dict:
+        """
+        Coordinates of the pieces of each color, read from the piece lists.
+
+        Returns:
+            dict: Lists of coordinates indexed by color.
+        """
+        return {color: [COORDS[cell] for cell in cells] for color, cells in self.__piece_cells.items()}
+
+
+    @property
+    def kings(self) -> dict:
+        """
+        Coordinates of the king of each color.
+
+        Returns:
+            dict: Coordinates indexed by color, colors without a king are missing.
+        """
+        return {color: COORDS[cell] for color, cell in self.__king_cells.items()}
+
+
+    def _moved_grid(self) -> ArrayLike:
+        """
+        Return the moved pieces as a 2D array, as expected by the constructor.
+
+        Returns:
+            np.array: 2D boolean array of the squares touched by a move.
+        """
+        return np.array([[bool(self.__moved[MAILBOX[x][y]]) for y in range(8)] for x in range(8)])
+
+
+    def __getitem__(self, key: tuple) -> int:
+        """
+        Allow square access through board[key].
+
+        Args:
+            key (tuple): Position on the board as (x, y) coordinates.
+
+        Returns:
+            int: Piece value at the given position.
+        """
+        x, y = key
+        return CODE_TO_VALUE[self.__cells[MAILBOX[x][y]]]
+
+
+    def __setitem__(self, key: tuple, value: int) -> None:
+        """
+        Allow square modification by setting board[key] = value.
+
+        Args:
+            key (tuple): Position on the board as (x, y) coordinates.
+            value (int): Piece value to be placed at the position.
+        """
+        x, y = key
+        cell = MAILBOX[x][y]
+        for color in (1, -1):
+            if cell in self.__piece_cells[color]:
+                self.__piece_cells[color].remove(cell)
+            if self.__king_cells.get(color) == cell:
+                del self.__king_cells[color]
+        code  = VALUE_TO_CODE[int(value)]
+        old   = CODE_TO_VALUE[self.__cells[cell]]
+        moved = bool(self.__moved[cell])
+        self.material += int(value) - old
+        self.zobrist_key ^= square_key(old, x, y, moved) ^ square_key(int(value), x, y, moved)
+        self.__cells[cell] = code
+        if code != EMPTY:
+            color = 1 if code > 0 else -1
+            self.__piece_cells[color].append(cell)
+            if abs(code) == KING:
+                self.__king_cells[color] = cell
+
+
+    def _is_attacked(self, cell: int, color: int) -> bool:
+        """
+        Check if a square is attacked by the pieces of a color, looking outward from the square.
+
+        Args:
+            cell (int): Mailbox index of the square.
+            color (int): Color of the attacking pieces, positive for White, negative for Black.
+
+        Returns:
+            bool: True if a piece of the color attacks the square, False otherwise.
+        """
+        cells = self.__cells
+
+        # A pawn attacks diagonally forward, so it stands diagonally behind the square
+        pawn = PAWN * color
+        if cells[cell - UP * color - 1] == pawn or cells[cell - UP * color + 1] == pawn:
+            return True
+
+        knight = KNIGHT * color
+        for step in KNIGHT_STEPS:
+            if cells[cell + step] == knight:
+                return True
+
+        king = KING * color
+        for step in KING_STEPS:
+            if cells[cell + step] == king:
+                return True
+
+        queen = QUEEN * color
+        for steps, slider in ((ROOK_STEPS, ROOK * color), (BISHOP_STEPS, BISHOP * color)):
+            for step in steps:
+                target = cell + step
+                while cells[target] == EMPTY:
+                    target += step
+                if cells[target] == slider or cells[target] == queen:
+                    return True
+
+        return False
+
+
+    def _is_check(self, color: int) -> bool:
+        """
+        Determine if the specified color is in check.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+
+        Returns:
+            bool: True if color's king is in check, False otherwise.
+        """
+        if color not in (1, -1):
+            return False
+        king = self.__king_cells.get(color)
+        return king is not None and self._is_attacked(king, -color)
+
+
+    def _pseudo_moves(self, cell: int, color: int) -> list:
+        """
+        Walk the offset lists of a piece over the mailbox to list its pseudo-legal targets.
+
+        Args:
+            cell (int): Mailbox index of the piece.
+            color (int): Color of the piece, positive for White, negative for Black.
+
+        Returns:
+            list: Mailbox indices of the target squares.
+        """
+        cells = self.__cells
+        kind = cells[cell] * color
+        targets = []
+
+        if kind == PAWN:
+            forward = cell + UP * color
+            if cells[forward] == EMPTY:
+                targets.append(forward)
+                if not self.__moved[cell] and cells[forward + UP * color] == EMPTY:
+                    targets.append(forward + UP * color)
+            for target in (forward - 1, forward + 1):
+                if cells[target] != OFF and cells[target] * color < 0:
+                    targets.append(target)
+
+        elif kind == KNIGHT or kind == KING:
+            for step in (KNIGHT_STEPS if kind == KNIGHT else KING_STEPS):
+                target = cells[cell + step]
+                if target != OFF and target * color <= 0:
+                    targets.append(cell + step)
+
+        else:
+            for step in SLIDER_STEPS[kind]:
+                target = cell + step
+                while cells[target] == EMPTY:
+                    targets.append(target)
+                    target += step
+                if cells[target] != OFF and cells[target] * color < 0:
+                    targets.append(target)
+
+        return targets
+
+
+    def iter_legal_moves(self, color: int, cells: list = None):
+        """
+        Generate lazily the legal moves of the specified color, filtered with check and pin masks.
+
+        Args:
+            color (int): Color indicator, positive for White, negative for Black.
+            cells (list): Mailbox indices of the pieces to generate moves for, every piece by default.
+
+        Yields:
+            tuple: Legal move as (piece coordinates, move coordinates).
+        """
+        board = self.__cells
+        if cells is None:
+            cells = list(self.__piece_cells[color])
+
+        king = self.__king_cells.get(color)
+        if king is None:  # No king to protect: every pseudo-legal move is legal
+            for cell in cells:
+                for target in self._pseudo_moves(cell, color):
+                    yield COORDS[cell], COORDS[target]
+            return
+
+        # Check and pin masks, walking outward from the king
+        checkers = 0
+        check_mask = set()
+        pins = {}
+        for target in (king + UP * color - 1, king + UP * color + 1):
+            if board[target] == -PAWN * color:
+                checkers += 1
+                check_mask.add(target)
+        for step in KNIGHT_STEPS:
+            if board[king + step] == -KNIGHT * color:
+                checkers += 1
+                check_mask.add(king + step)
+        for steps, slider in ((ROOK_STEPS, -ROOK * color), (BISHOP_STEPS, -BISHOP * color)):
+            for step in steps:
+                ray = []
+                pinned = None
+                target = king + step
+                while board[target] != OFF:
+                    ray.append(target)
+                    piece = board[target]
+                    if piece != EMPTY:
+                        if piece * color > 0:
+                            if pinned is not None:
+                                break
+                            pinned = target
+                        else:
+                            if piece == slider or piece == -QUEEN * color:
+                                if pinned is None:
+                                    checkers += 1
+                                    check_mask.update(ray)
+                                else:
+                                    pins[pinned] = set(ray)
+                            break
+                    target += step
+
+        for cell in cells:
+            if cell == king:
+                continue
+            if checkers >= 2:  # Double check: only the king can move
+                break
+            targets = self._pseudo_moves(cell, color)
+            if cell in pins:
+                targets = [target for target in targets if target in pins[cell]]
+            if checkers:
+                targets = [target for target in targets if target in check_mask]
+            for target in targets:
+                yield COORDS[cell], COORDS[target]
+
+        if king in cells:
+            # The king is lifted from the mailbox so that it does not hide the squares behind it from sliders
+            king_moves = []
+            board[king] = EMPTY
+            for step in KING_STEPS:
+                target = board[king + step]
+                if target != OFF and target * color <= 0 and not self._is_attacked(king + step, -color):
+                    king_moves.append(king + step)
+            board[king] = KING * color
+
+            # Castling: unmoved king and rook, empty squares in between, no attacked square on the king's path
+            if not checkers and not self.__moved[king]:
+                if (board[king + 1] == EMPTY and board[king + 2] == EMPTY and not self.__moved[king + 3]
+                        and not self._is_attacked(king + 1, -color) and not self._is_attacked(king + 2, -color)):
+                    king_moves.append(king + 2)
+                if (board[king - 1] == EMPTY and board[king - 2] == EMPTY and board[king - 3] == EMPTY
+                        and not self.__moved[king - 4]
+                        and not self._is_attacked(king - 1, -color) and not self._is_attacked(king - 2, -color)):
+                    king_moves.append(king - 2)
+
+            for target in king_moves:
+                yield COORDS[king], COORDS[target]
+
+
+    def possible_moves(self, piece_coord: tuple) -> list:
+        """
+        Generate legal moves for a piece at the given coordinates.
+
+        Args:
+            piece_coord (tuple): Coordinates of the piece to move.
+
+        Returns:
+            list: List of legal move coordinates.
+        """
+        x, y = piece_coord
+        color = 1 if self[piece_coord] > 0 else -1
+        return [move for _, move in self.iter_legal_moves(color, [MAILBOX[x][y]])]
+
+
+    def make_move(self, coord: tuple, new_coord: tuple) -> None:
+        """
+        Apply a move in place and push an undo record so that unmake_move() can restore the position.
+
+        Args:
+            coord (tuple): Current piece coordinates.
+            new_coord (tuple): New piece coordinates.
+
+        Returns:
+            None
+        """
+        cells        = self.__cells
+        moved        = self.__moved
+        x, y         = coord
+        new_x, new_y = new_coord
+        start        = MAILBOX[x][y]
+        end          = MAILBOX[new_x][new_y]
+        code         = cells[start]
+        captured     = cells[end]
+        piece        = CODE_TO_VALUE[code]
+
+        # Castling: the rook jumps over the king
+        rook_from, rook_to = None, None
+        if abs(code) == KING and abs(new_x - x) == 2:
+            rook_from, rook_to = (end + 1, end - 1) if new_x > x else (end - 2, end + 1)
+
+        # Piece lists: the moved piece keeps its slot, the captured piece leaves the opponent's list
+        color = 1 if code > 0 else -1
+        own   = self.__piece_cells[color]
+        own[own.index(start)] = end
+        captured_index = None
+        if captured != EMPTY:
+            enemy = self.__piece_cells[-color]
+            captured_index = enemy.index(end)
+            del enemy[captured_index]
+        if abs(code) == KING:
+            self.__king_cells[color] = end
+        if rook_from is not None and rook_from in own:
+            own[own.index(rook_from)] = rook_to
+
+        # Undo record: squares, moved piece, captured piece and its slot, moved flags, castling rook squares, Zobrist key and material
+        self.__undo_stack.append((start, end, code, captured, captured_index, moved[start], moved[end],
+                                  rook_from, rook_to, rook_from is not None and moved[rook_from], self.zobrist_key, self.material))
+
+        key = self.zobrist_key ^ ZOBRIST_PIECES[piece][x][y] ^ ZOBRIST_SIDE
+        if abs(piece) in CASTLING_PIECES and not moved[start]:
+            key ^= ZOBRIST_CASTLING[x][y]
+        if captured != EMPTY:
+            key ^= ZOBRIST_PIECES[CODE_TO_VALUE[captured]][new_x][new_y]
+            self.material -= CODE_TO_VALUE[captured]
+            if abs(CODE_TO_VALUE[captured]) in CASTLING_PIECES and not moved[end]:
+                key ^= ZOBRIST_CASTLING[new_x][new_y]
+
+        cells[end]   = code
+        cells[start] = EMPTY
+        moved[start] = 1
+        moved[end]   = 1
+
+        if rook_from is not None:
+            rook = cells[rook_from]
+            cells[rook_to]   = rook
+            cells[rook_from] = EMPTY
+            if rook != EMPTY:
+                rook = CODE_TO_VALUE[rook]
+                key ^= ZOBRIST_PIECES[rook][COORDS[rook_from][0]][new_y] ^ ZOBRIST_PIECES[rook][COORDS[rook_to][0]][new_y]
+                if not moved[rook_from]:
+                    key ^= ZOBRIST_CASTLING[COORDS[rook_from][0]][new_y]
+            moved[rook_from] = 1
+
+        # Promotion to a queen
+        if abs(code) == PAWN and ((new_y == 0 and code > 0) or (new_y == 7 and code < 0)):
+            cells[end] = QUEEN if code > 0 else -QUEEN
+            self.material += CODE_TO_VALUE[cells[end]] - piece
+            piece = CODE_TO_VALUE[cells[end]]
+
+        self.zobrist_key = key ^ ZOBRIST_PIECES[piece][new_x][new_y]
+        self.side = -self.side
+
+
+    def unmake_move(self) -> None:
+        """
+        Restore the position as it was before the last make_move() call.
+
+        Returns:
+            None
+        """
+        start, end, code, captured, captured_index, moved_start, moved_end, rook_from, rook_to, rook_moved, key, material = self.__undo_stack.pop()
+        cells = self.__cells
+        moved = self.__moved
+
+        color = 1 if code > 0 else -1
+        own   = self.__piece_cells[color]
+        own[own.index(end)] = start
+        if captured_index is not None:
+            self.__piece_cells[-color].insert(captured_index, end)
+        if abs(code) == KING:
+            self.__king_cells[color] = start
+        if rook_from is not None and rook_to in own:
+            own[own.index(rook_to)] = rook_from
+
+        if rook_from is not None:
+            cells[rook_from] = cells[rook_to]
+            cells[rook_to]   = EMPTY
+            moved[rook_from] = rook_moved
+
+        cells[start] = code
+        cells[end]   = captured
+        moved[start] = moved_start
+        moved[end]   = moved_end
+        self.zobrist_key = key
+        self.material    = material
+        self.side        = -self.side
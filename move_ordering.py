@@ -0,0 +1,131 @@
+from piece import PieceValues
+
+# Sort keys of the move categories, from the first tried to the last one
+TT_MOVE_SCORE = 1 << 30 # Best move stored in the transposition table
+CAPTURE_SCORE = 1 << 28 # Captures and promotions, ordered by MVV-LVA
+KILLER_SCORE  = 1 << 26 # Quiet moves that caused a cutoff at the same ply
+HISTORY_MAX   = KILLER_SCORE - 1 # Quiet moves are ordered by their history score, kept below the killers
+LOSING_CAPTURE_SCORE = -CAPTURE_SCORE # Captures losing material by static exchange evaluation, tried last
+
+# Value gained by a promotion, ordered like the capture of the difference
+PROMOTION_GAIN = PieceValues.QUEEN_WHITE.value - PieceValues.PAWN_WHITE.value
+
+# Number of killer moves kept per ply
+N_KILLERS = 2
+
+
+class MoveOrderer:
+    """
+    Order the moves of a node so that alpha-beta cuts as early as possible: the transposition
+    table move first, then captures by MVV-LVA (most valuable victim, least valuable attacker),
+    then the killer moves of the ply, then the other quiet moves by history score, and finally
+    the captures that lose material by static exchange evaluation.
+
+    Killers are kept per search, the butterfly history table (side x start square x end square)
+    is kept between moves and aged at the start of each search.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize empty killer and history tables.
+        """
+        self.killers = [] # Killer moves per ply, most recent first
+        self.history = {1: [0] * 4096, -1: [0] * 4096} # Butterfly table per color, indexed by start square * 64 + end square
+
+
+    def age(self) -> None:
+        """
+        Age the tables between two moves: forget the killers and halve the history scores.
+
+        Returns:
+            None
+        """
+        self.killers = []
+        for table in self.history.values():
+            table[:] = [score >> 1 for score in table]
+
+
+    def clear(self) -> None:
+        """
+        Reset the killer and history tables.
+
+        Returns:
+            None
+        """
+        self.killers = []
+        self.history = {1: [0] * 4096, -1: [0] * 4096}
+
+
+    def order(self, board, moves: list, color: int, ply: int, tt_move: tuple = None, see: bool = True) -> list:
+        """
+        Sort the moves of a node, best candidates first.
+
+        Args:
+            board (Board): Board the moves are played on.
+            moves (list): Legal moves as (piece coordinates, move coordinates).
+            color (int): Color of the side to move.
+            ply (int): Distance to the root of the search.
+            tt_move (tuple): Best move stored in the transposition table for this position, or None.
+            see (bool): Evaluate the exchanges of the captures, False when the losing captures are already filtered out.
+
+        Returns:
+            list: The moves sorted by decreasing score.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history[color]
+
+        scored = []
+        for coord, move in moves:
+            x, y = coord
+            new_x, new_y = move
+            victim   = board[move]
+            attacker = board[coord]
+            if tt_move is not None and (coord, move) == tt_move:
+                score = TT_MOVE_SCORE
+            elif victim != 0:
+                # A capture of a piece worth at least the attacker cannot lose material, skip the exchange evaluation
+                good = not see or abs(victim) >= abs(attacker) or board.see(coord, move) >= 0
+                score = (CAPTURE_SCORE if good else LOSING_CAPTURE_SCORE) + abs(victim) * 1000 - abs(attacker)
+            elif abs(attacker) == PieceValues.PAWN_WHITE.value and new_y in (0, 7):
+                score = CAPTURE_SCORE + PROMOTION_GAIN * 1000
+            elif (coord, move) in killers:
+                score = KILLER_SCORE + N_KILLERS - killers.index((coord, move))
+            else:
+                score = history[(x * 8 + y) * 64 + new_x * 8 + new_y]
+            scored.append((score, coord, move))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(coord, move) for _, coord, move in scored]
+
+
+    def update(self, board, coord: tuple, move: tuple, color: int, ply: int, depth: int) -> None:
+        """
+        Record a move that caused a cutoff. Captures are already well ordered by MVV-LVA,
+        so only quiet moves are stored as killers and rewarded in the history table.
+
+        Args:
+            board (Board): Board before the move is played.
+            coord (tuple): Coordinates of the moved piece.
+            move (tuple): Coordinates of the destination square.
+            color (int): Color of the side that played the move.
+            ply (int): Distance to the root of the search.
+            depth (int): Remaining depth of the node, deeper cutoffs weigh more.
+
+        Returns:
+            None
+        """
+        if board[move] != 0:
+            return
+
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if (coord, move) not in killers:
+            killers.insert(0, (coord, move))
+            del killers[N_KILLERS:]
+
+        x, y = coord
+        new_x, new_y = move
+        index = (x * 8 + y) * 64 + new_x * 8 + new_y
+        table = self.history[color]
+        table[index] = min(HISTORY_MAX, table[index] + depth * depth)
@@ -80,6 +80,64 @@ def get_image_by_value(value: int) -> str:
     return value_to_image.get(value, None)
 
 
+def _squares_from(x: int, y: int, offsets: list) -> list:
+    """
+    List the squares reached from (x, y) with one step of each offset
+
+    Args:
+        x (int): The x-coordinate of the start square
+        y (int): The y-coordinate of the start square
+        offsets (list): List of (dx, dy) steps
+
+    Returns:
+        list: List of coordinates within the board
+    """
+    return [(x + dx, y + dy) for dx, dy in offsets if is_within_board((x + dx, y + dy))]
+
+
+def _rays_from(x: int, y: int, directions: list) -> list:
+    """
+    List the rays leaving (x, y) in each direction, ordered from the nearest square outward
+
+    Args:
+        x (int): The x-coordinate of the start square
+        y (int): The y-coordinate of the start square
+        directions (list): List of (dx, dy) directions
+
+    Returns:
+        list: List of non-empty rays, each one a list of coordinates
+    """
+    rays = []
+    for dx, dy in directions:
+        ray = []
+        step_x, step_y = x + dx, y + dy
+        while is_within_board((step_x, step_y)):
+            ray.append((step_x, step_y))
+            step_x += dx
+            step_y += dy
+        if ray:
+            rays.append(ray)
+    return rays
+
+
+KNIGHT_OFFSETS      = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+KING_OFFSETS        = [(dx, dy) for dx, dy in product([-1, 0, 1], repeat=2) if (dx, dy) != (0, 0)]
+ROOK_DIRECTIONS     = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BISHOP_DIRECTIONS   = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+# Precomputed attack tables, indexed by [x][y]
+KNIGHT_ATTACKS = [[_squares_from(x, y, KNIGHT_OFFSETS) for y in range(8)] for x in range(8)]
+KING_ATTACKS   = [[_squares_from(x, y, KING_OFFSETS) for y in range(8)] for x in range(8)]
+PAWN_ATTACKS   = {  # Squares attacked by a pawn of the given color, White pawns go up the board (y decreases)
+    color: [[_squares_from(x, y, [(-1, -color), (1, -color)]) for y in range(8)] for x in range(8)]
+    for color in (1, -1)
+}
+
+# Precomputed rays for the sliding pieces, indexed by [x][y]
+ROOK_RAYS   = [[_rays_from(x, y, ROOK_DIRECTIONS) for y in range(8)] for x in range(8)]
+BISHOP_RAYS = [[_rays_from(x, y, BISHOP_DIRECTIONS) for y in range(8)] for x in range(8)]
+
+
 class MovePieces:
     """
     Abstract methods for the possible moves of the chess pieces
@@ -102,7 +160,7 @@ class MovePieces:
         """
         value = board[x, y]
         moves = []
-        dir = np.sign(value)
+        dir = 1 if value > 0 else -1
 
         # Forward move
         if is_move_valid((x, y - dir), board, value):
@@ -143,8 +201,8 @@ class MovePieces:
                 step_x, step_y = dx, dy
                 while is_move_valid((x + step_x, y + step_y), board, value):
                     moves.append((x + step_x, y + step_y))
-                    step_x += np.sign(dx)
-                    step_y += np.sign(dy)
+                    step_x += dx
+                    step_y += dy
                 
                 # Check for capture
                 if is_move_valid((x + step_x, y + step_y), board, value, True):
@@ -202,8 +260,8 @@ class MovePieces:
             step_x, step_y = dx, dy
             while is_move_valid((x + step_x, y + step_y), board, value):
                 moves.append((x + step_x, y + step_y))
-                step_x += np.sign(dx)
-                step_y += np.sign(dy)
+                step_x += dx
+                step_y += dy
 
             # Check for capture
             if is_move_valid((x + step_x, y + step_y), board, value, True):
@@ -234,8 +292,8 @@ class MovePieces:
             step_x, step_y = dx, dy
             while is_move_valid((x + step_x, y + step_y), board, value):
                 moves.append((x + step_x, y + step_y))
-                step_x += np.sign(dx)
-                step_y += np.sign(dy)
+                step_x += dx
+                step_y += dy
 
             # Check for capture
             if is_move_valid((x + step_x, y + step_y), board, value, True):
@@ -303,5 +361,171 @@ class MovePieces:
             return MovePieces._queen_move(board, moved, *coord)
         elif abs(piece_value) == 900:
             return MovePieces._king_move(board, moved, *coord)
-        
-        
+
+
+    @abstractmethod
+    def is_attacked(board: ArrayLike, coord: tuple[int, int], color: int) -> bool:
+        """
+        Check if a square is attacked by the pieces of a color, looking outward from the square
+
+        Args:
+            board (ArrayLike): The current game board
+            coord (tuple): The coordinates of the square
+            color (int): Color of the attacking pieces, positive for White, negative for Black
+
+        Returns:
+            bool: True if a piece of the color attacks the square, False otherwise
+        """
+        x, y = coord
+
+        # Pawns attacking the square stand where a pawn of the other color would attack from the square
+        pawn = PieceValues.PAWN_WHITE.value * color
+        for square in PAWN_ATTACKS[-color][x][y]:
+            if board[square] == pawn:
+                return True
+
+        knight = PieceValues.KNIGHT_WHITE.value * color
+        for square in KNIGHT_ATTACKS[x][y]:
+            if board[square] == knight:
+                return True
+
+        king = PieceValues.KING_WHITE.value * color
+        for square in KING_ATTACKS[x][y]:
+            if board[square] == king:
+                return True
+
+        # Sliding pieces: only the first piece met along each ray can attack the square
+        queen = PieceValues.QUEEN_WHITE.value * color
+        for rays, slider in ((ROOK_RAYS[x][y], PieceValues.ROOK_WHITE.value * color),
+                             (BISHOP_RAYS[x][y], PieceValues.BISHOP_WHITE.value * color)):
+            for ray in rays:
+                for square in ray:
+                    piece = board[square]
+                    if piece != 0:
+                        if piece == slider or piece == queen:
+                            return True
+                        break
+
+        return False
+
+
+    @abstractmethod
+    def _checks_and_pins(board: ArrayLike, king: tuple[int, int], color: int) -> tuple:
+        """
+        Find the pieces checking a king and the pieces pinned against it, walking outward from the king
+
+        Args:
+            board (ArrayLike): The current game board
+            king (tuple): The coordinates of the king
+            color (int): Color of the king, positive for White, negative for Black
+
+        Returns:
+            tuple: Number of checking pieces, set of squares that stop the check (None if not in check),
+                   and dictionary mapping each pinned piece to the set of squares it can still move to
+        """
+        x, y = king
+        checkers = 0
+        check_mask = set()
+        pins = {}
+
+        pawn = -PieceValues.PAWN_WHITE.value * color
+        for square in PAWN_ATTACKS[color][x][y]:
+            if board[square] == pawn:
+                checkers += 1
+                check_mask.add(square)
+
+        knight = -PieceValues.KNIGHT_WHITE.value * color
+        for square in KNIGHT_ATTACKS[x][y]:
+            if board[square] == knight:
+                checkers += 1
+                check_mask.add(square)
+
+        queen = -PieceValues.QUEEN_WHITE.value * color
+        for rays, slider in ((ROOK_RAYS[x][y], -PieceValues.ROOK_WHITE.value * color),
+                             (BISHOP_RAYS[x][y], -PieceValues.BISHOP_WHITE.value * color)):
+            for ray in rays:
+                pinned = None
+                for i, square in enumerate(ray):
+                    piece = board[square]
+                    if piece == 0:
+                        continue
+                    if piece * color > 0:
+                        if pinned is not None:
+                            break  # Two own pieces on the ray: no pin
+                        pinned = square
+                    else:
+                        if piece == slider or piece == queen:
+                            if pinned is None:
+                                checkers += 1
+                                check_mask.update(ray[:i + 1])
+                            else:
+                                pins[pinned] = set(ray[:i + 1])
+                        break
+
+        return checkers, (check_mask if checkers else None), pins
+
+
+    @abstractmethod
+    def legal_moves(board: ArrayLike, moved: ArrayLike, color: int, coords: list = None, king: tuple = None):
+        """
+        Generate lazily the legal moves of a color, using check and pin masks computed once for the position.
+        The board may be modified between two moves as long as it is restored before asking for the next one
+
+        Args:
+            board (ArrayLike): The current game board
+            moved (ArrayLike): The array of moved pieces
+            color (int): Color to move, positive for White, negative for Black
+            coords (list): Coordinates of the pieces to generate moves for, all the pieces of the color if None
+            king (tuple): Coordinates of the king of the color, looked up on the board if None
+
+        Yields:
+            tuple: Legal move as (piece coordinates, move coordinates)
+        """
+        if coords is None:
+            coords = [(int(x), int(y)) for x, y in zip(*np.where(board * color > 0))]
+
+        if king is None:
+            king_x, king_y = np.where(board == PieceValues.KING_WHITE.value * color)
+            if len(king_x) == 0:  # No king to protect: every pseudo-legal move is legal
+                for coord in coords:
+                    for move in MovePieces.possible_moves(board, moved, coord):
+                        yield coord, move
+                return
+            king = (int(king_x[0]), int(king_y[0]))
+
+        checkers, check_mask, pins = MovePieces._checks_and_pins(board, king, color)
+
+        for coord in coords:
+            coord = (int(coord[0]), int(coord[1]))
+            if coord == king:
+                continue
+            if checkers >= 2:  # Double check: only the king can move
+                break
+            targets = MovePieces.possible_moves(board, moved, coord)
+            if coord in pins:
+                targets = [move for move in targets if move in pins[coord]]
+            if check_mask is not None:
+                targets = [move for move in targets if move in check_mask]
+            for move in targets:
+                yield coord, move
+
+        if king in coords:
+            # The king is lifted from the board so that it does not hide the squares behind it from sliders
+            x, y = king
+            targets = MovePieces._king_move(board, moved, x, y)
+            king_value = board[king]
+            board[king] = 0
+            king_moves = []
+            for move in targets:
+                new_x = move[0]
+                if abs(new_x - x) == 2:
+                    # Castling: the king cannot leave, cross or land on an attacked square
+                    step = 1 if new_x > x else -1
+                    if checkers or any(MovePieces.is_attacked(board, (x + k * step, y), -color) for k in (1, 2)):
+                        continue
+                elif MovePieces.is_attacked(board, move, -color):
+                    continue
+                king_moves.append(move)
+            board[king] = king_value
+            for move in king_moves:
+                yield king, move
@@ -0,0 +1,178 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from transposition import TranspositionTable, EXACT
+from move_ordering import MoveOrderer
+
+# Depth from which the moves of the root are split between the workers, shallower iterations are searched serially
+SPLIT_DEPTH = 3
+
+# Seconds between two checks of the budgets while waiting for the workers
+POLL_INTERVAL = 0.005
+
+# State of a worker process, set by _init_worker and kept warm between the searches of the game
+_alpha    = None # Score of the best root move known, shared by all the workers
+_stop     = None # Event raised by the main process to stop the workers
+_tt       = None # Transposition table of the worker
+_ordering = None # Killer and history tables of the worker
+
+
+def _init_worker(alpha, stop, hash_size: int) -> None:
+    """
+    Initialize a worker process of the pool.
+
+    Args:
+        alpha (Value): Score of the best root move known, for the side to move at the root.
+        stop (Event): Event raised by the main process to stop the workers.
+        hash_size (int): Size of the transposition table of the worker in megabytes.
+
+    Returns:
+        None
+    """
+    global _alpha, _stop, _tt, _ordering
+    _alpha    = alpha
+    _stop     = stop
+    _tt       = TranspositionTable(hash_size)
+    _ordering = MoveOrderer()
+
+
+def _search_root_move(state: tuple, coord: tuple, move: tuple, depth: int, generation: int) -> tuple:
+    """
+    Search one move of the root in a worker process, raising the shared alpha when the move is better.
+
+    Args:
+        state (tuple): Root position serialized by Board._state().
+        coord (tuple): Coordinates of the moved piece.
+        move (tuple): Coordinates of the destination square.
+        depth (int): Depth of the root.
+        generation (int): Generation of the transposition table of the main process, a new one starts a new search.
+
+    Returns:
+        tuple: Piece coordinates, move coordinates, score for the side to move, True if the score is exact
+        rather than an upper bound, nodes and quiescence nodes, or None if the search was stopped.
+    """
+    if _tt.generation != generation:
+        _tt.generation = generation
+        _ordering.age()
+
+    board = state[0]._from_state(state, _tt)
+    board.ordering = _ordering
+    board._set_limits(None, None, _stop)
+
+    alpha = _alpha.value
+    eval  = board._search_root_move(coord, move, depth, alpha)
+    if eval is None:
+        return None
+    with _alpha.get_lock():
+        if eval > _alpha.value:
+            _alpha.value = eval
+    return coord, move, eval, eval > alpha, board.stats.nodes, board.stats.qnodes
+
+
+class RootSplit:
+    """
+    Root-splitting parallel search: the first move of the root is searched by the main process to get
+    a score to beat, then the other moves are searched by a pool of worker processes. The workers
+    share the best score found through a multiprocessing.Value, so that late root moves are still pruned.
+    """
+
+    def __init__(self, threads: int, tt: TranspositionTable) -> None:
+        """
+        Start the pool of worker processes, which stay alive between searches.
+
+        Args:
+            threads (int): Number of processes searching, including the main one, which searches the first move of the root.
+            tt (TranspositionTable): Transposition table of the main process, each worker allocates one of the same size.
+        """
+        self.threads = threads
+        self.alpha   = multiprocessing.Value("d", -np.inf)
+        self.stop    = multiprocessing.Event()
+        self.pool    = ProcessPoolExecutor(max_workers=threads - 1, initializer=_init_worker,
+                                           initargs=(self.alpha, self.stop, tt.size_mb))
+
+
+    def search(self, board, time_ms: float, nodes: int, max_depth: int) -> tuple:
+        """
+        Search a position with the pool, see Board.search for the arguments.
+
+        Args:
+            board (Board): Board of the main process, its statistics and tables being already set up.
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, counting the nodes of the workers, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the last completed iteration.
+        """
+        board.stats.threads = self.threads
+        return board._iterative_deepening(time_ms, nodes, max_depth, root_search=lambda depth: self.__split(board, depth),
+                                          split_depth=SPLIT_DEPTH)
+
+
+    def __split(self, board, depth: int) -> tuple:
+        """
+        Search the root at a given depth, splitting its moves between the workers.
+
+        Args:
+            board (Board): Board of the main process.
+            depth (int): Depth of the root.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score from White's point of view,
+            or None if the budget was exhausted.
+        """
+        color = board.side
+        moves = board.legal_moves(color)
+        if not moves:
+            return board.minimax(depth)
+        entry = board.tt.probe(board.zobrist_key)
+        moves = board.ordering.order(board, moves, color, 0, entry[0] if entry is not None else None)
+
+        # The first move, the most likely to be the best one, is searched alone to get a score to beat
+        coord, move = moves[0]
+        best_eval = board._search_root_move(coord, move, depth, -np.inf)
+        if best_eval is None:
+            return None
+        best_coord, best_move, best_exact = coord, move, True
+        self.alpha.value = best_eval
+
+        state   = board._state()
+        pending = {self.pool.submit(_search_root_move, state, coord, move, depth, board.tt.generation)
+                   for coord, move in moves[1:]}
+        stats   = board.stats
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    coord, move, eval, exact, worker_nodes, worker_qnodes = result
+                    stats.nodes  += worker_nodes
+                    stats.qnodes += worker_qnodes
+                    # An upper bound equal to the best score is not better than it
+                    if eval > best_eval or (eval == best_eval and exact and not best_exact):
+                        best_coord, best_move, best_eval, best_exact = coord, move, eval, exact
+                if pending and board._out_of_budget():
+                    return None
+        finally:
+            if pending:
+                for future in pending:
+                    future.cancel()
+                self.stop.set()
+                wait(pending)
+            self.stop.clear()
+
+        board.tt.store(board.zobrist_key, (best_coord, best_move), best_eval, depth, EXACT)
+        return best_coord, best_move, best_eval * color
+
+
+    def close(self) -> None:
+        """
+        Stop the pool of worker processes.
+
+        Returns:
+            None
+        """
+        self.stop.set()
+        self.pool.shutdown(cancel_futures=True)
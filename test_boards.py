@@ -0,0 +1,116 @@
+import random
+import pytest
+from board_ia import Board
+from bitboard import BitBoard
+from mailbox_board import MailboxBoard
+from zobrist import zobrist_hash, ZOBRIST_SIDE
+
+# Board representations checked against each other
+BACKENDS = [Board, BitBoard, MailboxBoard]
+
+# Number of random games played and maximum number of plies per game
+GAMES = 8
+MAX_PLIES = 300
+
+
+@pytest.fixture(autouse=True)
+def check_incremental(monkeypatch) -> None:
+    """
+    Cross-check the incremental material against a full recompute at every evaluation.
+    """
+    monkeypatch.setattr(Board, "check_incremental", True)
+
+
+def perft(board, depth: int) -> int:
+    """
+    Count the leaves of the legal move tree.
+
+    Args:
+        board (Board): Position to count from, restored afterwards.
+        depth (int): Depth of the tree.
+
+    Returns:
+        int: Number of leaves.
+    """
+    if depth == 0:
+        return 1
+    total = 0
+    for coord, move in board.legal_moves(board.side):
+        board.make_move(coord, move)
+        total += perft(board, depth - 1)
+        board.unmake_move()
+    return total
+
+
+def snapshot(board) -> tuple:
+    """
+    Capture what make_move() and unmake_move() must keep consistent.
+
+    Args:
+        board (Board): Board to capture.
+
+    Returns:
+        tuple: Grid, moved flags, Zobrist key, material and side to move.
+    """
+    return board.grid.tolist(), board._moved_grid().tolist(), board.zobrist_key, board.material, board.side
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_perft_initial_position(board_class) -> None:
+    assert [perft(board_class(), depth) for depth in (1, 2, 3)] == [20, 400, 8902]
+
+
+def play_random_game(seed: int) -> int:
+    """
+    Play the same random game on every backend, checking at each ply that the legal moves agree, that every
+    move is undone exactly, and that the Zobrist key and material follow the position.
+
+    Args:
+        seed (int): Seed of the random moves.
+
+    Returns:
+        int: Number of promotions played.
+    """
+    rng = random.Random(seed)
+    boards = [board_class() for board_class in BACKENDS]
+    promotions = 0
+    for _ in range(MAX_PLIES):
+        side = boards[0].side
+        moves = [sorted(board.legal_moves(side)) for board in boards]
+        assert moves[1] == moves[0] and moves[2] == moves[0], "Move generators disagree"
+        if not moves[0]:
+            break
+
+        for board in boards:
+            before = snapshot(board)
+            for coord, move in moves[0]:
+                board.make_move(coord, move)
+                board.unmake_move()
+                assert snapshot(board) == before
+
+        coord, move = rng.choice(moves[0])
+        promotions += int(abs(boards[0][coord]) == 10 and move[1] in (0, 7))
+        for board in boards:
+            board.move(coord, move)
+            board.score()
+            key = zobrist_hash(board.grid, board._moved_grid()) ^ (ZOBRIST_SIDE if board.side < 0 else 0)
+            assert board.zobrist_key == key, "Incremental Zobrist key out of sync with the board"
+        assert snapshot(boards[1]) == snapshot(boards[0]) and snapshot(boards[2]) == snapshot(boards[0])
+    return promotions
+
+
+def test_random_games() -> None:
+    assert sum(play_random_game(seed) for seed in range(GAMES)) > 0, "No promotion played, the games do not cover them"
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_setitem_keeps_incremental_state(board_class) -> None:
+    rng = random.Random(0)
+    board = board_class()
+    for _ in range(200):
+        x, y = rng.randrange(8), rng.randrange(8)
+        if abs(board[x, y]) == 900:
+            continue
+        board[x, y] = rng.choice([0, 10, -10, 30, -40, 50, -50, 90])
+        assert board.zobrist_key == zobrist_hash(board.grid, board._moved_grid())
+        assert board.material == board._material_from_scratch()
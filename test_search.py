@@ -0,0 +1,119 @@
+import numpy as np
+import board_ia
+import pytest
+from board_ia import Board, CHECK_EVERY, MATE_SCORE
+from bitboard import BitBoard
+from mailbox_board import MailboxBoard
+
+# Board representations the search is checked on
+BACKENDS = [Board, BitBoard, MailboxBoard]
+
+
+def position(board_class, pieces: dict, unmoved: tuple = ()) -> Board:
+    """
+    Build a position from a few pieces, every piece counting as moved unless listed.
+
+    Args:
+        board_class (type): Board representation.
+        pieces (dict): Piece values by (x, y) coordinates.
+        unmoved (tuple): Coordinates of the pieces that have not moved yet.
+
+    Returns:
+        Board: The position, White to move.
+    """
+    grid = np.zeros((8, 8), dtype=int)
+    for coord, piece in pieces.items():
+        grid[coord] = piece
+    moved = np.ones((8, 8), dtype=bool)
+    for coord in unmoved:
+        moved[coord] = False
+    return board_class(grid, moved)
+
+
+def queen_attacked(board_class) -> Board:
+    """
+    Build a middlegame position where the White queen is attacked by a pawn.
+    White: K h1, R a3, R b2, N a1, Q d4. Black: K h8, R f8, pawns c5, b6, g7, h7.
+
+    Args:
+        board_class (type): Board representation.
+
+    Returns:
+        Board: The position, White to move.
+    """
+    return position(board_class, {(7, 7): 900, (0, 5): 50, (1, 6): 50, (0, 7): 40, (3, 4): 90,
+                                  (7, 0): -900, (5, 0): -50, (2, 3): -10, (1, 2): -10, (6, 1): -10, (7, 1): -10},
+                    unmoved=((6, 1), (7, 1)))
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_root_moves_are_never_pruned(board_class, depth: int) -> None:
+    # Only a quiet queen move, late in the order, saves the queen
+    board = queen_attacked(board_class)
+    coord, _, score = board.search(max_depth=depth)
+    assert coord == (3, 4) and score == 140
+
+
+@pytest.mark.parametrize("budget", [3000, 10000])
+def test_node_budget_counts_quiescence_nodes(budget: int) -> None:
+    board = Board()
+    board.search(nodes=budget, max_depth=64)
+    # The budget is checked every CHECK_EVERY nodes of either kind
+    assert budget <= board.stats.nodes + board.stats.qnodes < budget + 2 * CHECK_EVERY
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("defenders, expected", [({}, 10), ({(2, 1): -10}, -40), ({(2, 1): -10, (3, 6): 50}, -30)])
+def test_see_of_a_rook_taking_a_pawn(board_class, defenders: dict, expected: int) -> None:
+    # White: K h1, R d4 taking the pawn on d6. Black: K h8, pawn d6, defended by the c7 pawn in the last two cases,
+    # where the rook on d2 behind the first one recaptures in the last case
+    board = position(board_class, {(7, 7): 900, (3, 4): 50, (7, 0): -900, (3, 2): -10, **defenders})
+    assert board.see((3, 4), (3, 2)) == expected
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_quiescence_takes_a_hanging_queen(board_class) -> None:
+    # White: K h1, R d4. Black: K h8, Q d6, left hanging on the file of the rook
+    board = position(board_class, {(7, 7): 900, (3, 4): 50, (7, 0): -900, (3, 2): -90})
+    board.make_move((3, 4), (3, 2))
+    expected = board.score()
+    board.unmake_move()
+    assert board.quiescence(-np.inf, np.inf) == expected > board.score()
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_quiescence_skips_a_losing_capture(board_class) -> None:
+    # White: K h1, R d4. Black: K h8, pawn d6 defended by the c7 pawn, so the static evaluation stands
+    board = position(board_class, {(7, 7): 900, (3, 4): 50, (7, 0): -900, (3, 2): -10, (2, 1): -10})
+    assert board.quiescence(-np.inf, np.inf) == board.score()
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+def test_null_move_keeps_the_score(board_class) -> None:
+    board, reference = queen_attacked(board_class), queen_attacked(board_class)
+    reference.null_move = False
+    assert board.search(max_depth=4)[2] == reference.search(max_depth=4)[2]
+    assert board.stats.null_cutoffs > 0 and board.stats.nodes < reference.stats.nodes
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("window", [board_ia.ASPIRATION_WINDOW, 1])
+def test_aspiration_windows_keep_the_score(board_class, window: int, monkeypatch) -> None:
+    # A window of 1 makes the score of the previous iteration miss, so the root is searched again
+    monkeypatch.setattr(board_ia, "ASPIRATION_WINDOW", window)
+    board = queen_attacked(board_class)
+    assert board.search(max_depth=4)[2] == queen_attacked(board_class).minimax(4)[2]
+    if window == 1:
+        assert board.stats.fail_highs + board.stats.fail_lows > 0
+
+
+@pytest.mark.parametrize("board_class", BACKENDS)
+@pytest.mark.parametrize("depth", [1, 3, 5])
+def test_shortest_mate_is_played(board_class, depth: int) -> None:
+    # Scholar's mate: 1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6, then Qxf7 mates
+    board = board_class()
+    for coord, move in [((4, 6), (4, 4)), ((4, 1), (4, 3)), ((5, 7), (2, 4)), ((1, 0), (2, 2)), ((3, 7), (7, 3)), ((6, 0), (5, 2))]:
+        board.move(coord, move)
+    # Deeper iterations find longer mates too, mate-distance scoring keeps the mate in one ply ahead
+    assert board.search(max_depth=depth) == ((7, 3), (5, 1), MATE_SCORE - 1)
@@ -0,0 +1,245 @@
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# Bound types of a stored score
+EXACT = 0 # The score is the exact minimax value of the position
+LOWER = 1 # The search failed high: the real value is at least the score
+UPPER = 2 # The search failed low: the real value is at most the score
+
+# Stored scores are 32-bit fixed-point integers in 1/SCORE_SCALE units, infinite scores are saturated to SCORE_INF
+SCORE_INF   = 2**31 - 1
+SCORE_SCALE = 100
+
+# Layout of one entry: 8 + 2 + 4 + 1 + 1 = 16 bytes. The 8 bytes after the key form the data word of the entry,
+# and the key is stored XORed with it so that an entry half written by another process is detected on probe
+ENTRY_DTYPE = np.dtype([
+    ("key", np.uint64),   # Zobrist key of the position XOR the data word
+    ("move", np.uint16),  # Best move packed by pack_move, 0 if none
+    ("score", np.int32),  # Score from the point of view of the side to move
+    ("depth", np.uint8),  # Remaining depth of the search that produced the score
+    ("flags", np.uint8),  # Bound type on the 2 low bits, generation on the 6 high bits
+])
+
+
+def pack_move(move: tuple) -> int:
+    """
+    Pack a move into 16 bits: 6 bits for the start square, 6 bits for the end square.
+
+    Args:
+        move (tuple): Move as (piece coordinates, move coordinates), or None.
+
+    Returns:
+        int: Packed move, 0 if there is no move.
+    """
+    if move is None:
+        return 0
+    (x, y), (new_x, new_y) = move
+    return (x * 8 + y) | ((new_x * 8 + new_y) << 6)
+
+
+def unpack_move(data: int) -> tuple:
+    """
+    Unpack a move packed by pack_move.
+
+    Args:
+        data (int): Packed move.
+
+    Returns:
+        tuple: Move as (piece coordinates, move coordinates), or None if there is no move.
+    """
+    if data == 0:
+        return None
+    start, end = data & 0x3F, data >> 6
+    return (start >> 3, start & 7), (end >> 3, end & 7)
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table indexed by Zobrist key.
+
+    Entries live in a preallocated numpy structured array filling the configured size, whatever
+    it is: positions are spread over the buckets by the key modulo their number.
+    The table is split into buckets of two slots: the first one keeps the deepest
+    entry of the current search (depth-preferred), the second one is always replaced.
+    Entries written by a previous search (older generation) are replaced first.
+
+    The table can be placed in shared memory so that the processes of a parallel search use it
+    at the same time without locks: each entry is written as two 8-byte words, the data word and
+    the key XORed with it, and a probe only accepts an entry whose two words match.
+    """
+
+    def __init__(self, size_mb: int = 64, shared: bool = False, name: str = None) -> None:
+        """
+        Allocate the table, or attach to a table already in shared memory.
+
+        Args:
+            size_mb (int): Memory budget of the table in megabytes.
+            shared (bool): If True, allocate the table in a new shared memory block.
+            name (str): Name of the shared memory block of an existing table to attach to.
+        """
+        self.buckets    = max(1, size_mb * 2**20 // ENTRY_DTYPE.itemsize // 2) # Buckets of two slots
+        n_entries       = 2 * self.buckets
+        self.size_mb    = size_mb
+        self.generation = 0
+
+        self.shm     = None # Shared memory block holding the table, None if the table is private
+        self.__owner = False # True for the process that created the shared memory block
+        if name is not None:
+            self.shm   = SharedMemory(name=name)
+            self.table = np.ndarray(n_entries, dtype=ENTRY_DTYPE, buffer=self.shm.buf)
+        elif shared:
+            self.shm     = SharedMemory(create=True, size=n_entries * ENTRY_DTYPE.itemsize)
+            self.__owner = True
+            self.table   = np.ndarray(n_entries, dtype=ENTRY_DTYPE, buffer=self.shm.buf)
+            self.table.fill(0)
+        else:
+            self.table = np.zeros(n_entries, dtype=ENTRY_DTYPE)
+
+        # Word views on the table: the key word and the data word (move, score, depth, flags) of each slot.
+        # Entries are only read and written through these words, the fields of ENTRY_DTYPE match them on little-endian machines
+        words = self.table.view(np.uint64)
+        self.__keys = words[0::2]
+        self.__data = words[1::2]
+
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle a shared table as the name of its memory block, so that other processes attach to it
+        instead of receiving a copy.
+
+        Returns:
+            tuple: Constructor and arguments rebuilding the table.
+        """
+        if self.shm is None:
+            raise ValueError("Only a transposition table in shared memory can be sent to another process")
+        return TranspositionTable, (self.size_mb, False, self.shm.name)
+
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block, and free it in the process that created it.
+
+        Returns:
+            None
+        """
+        if self.shm is None:
+            return
+        self.__keys = self.__data = self.table = None # Release the views on the buffer first
+        self.shm.close()
+        if self.__owner:
+            self.shm.unlink()
+        self.shm = None
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of slots of the table.
+
+        Returns:
+            int: Number of slots.
+        """
+        return len(self.table)
+
+
+    def new_search(self) -> None:
+        """
+        Age the table between two moves so that entries of previous searches are replaced first.
+
+        Returns:
+            None
+        """
+        self.generation = (self.generation + 1) & 0x3F
+
+
+    def clear(self) -> None:
+        """
+        Remove every entry of the table.
+
+        Returns:
+            None
+        """
+        self.table.fill(0)
+        self.generation = 0
+
+
+    def probe(self, key: int) -> tuple:
+        """
+        Look up a position in the table.
+
+        Args:
+            key (int): Zobrist key of the position.
+
+        Returns:
+            tuple: Best move, score, depth and bound type of the entry, or None if the position is not stored.
+        """
+        index = key % self.buckets * 2
+        for slot in (index, index + 1):
+            data = int(self.__data[slot])
+            if int(self.__keys[slot]) ^ data == key:
+                score = (data >> 16) & 0xFFFFFFFF
+                if score >= 2**31:
+                    score -= 2**32
+                if abs(score) == SCORE_INF:
+                    score = np.inf if score > 0 else -np.inf
+                else:
+                    score /= SCORE_SCALE
+                return unpack_move(data & 0xFFFF), score, (data >> 48) & 0xFF, (data >> 56) & 3
+        return None
+
+
+    def store(self, key: int, move: tuple, score: float, depth: int, bound: int) -> None:
+        """
+        Store the result of a search, following the depth-preferred / always-replace scheme.
+
+        Args:
+            key (int): Zobrist key of the position.
+            move (tuple): Best move found as (piece coordinates, move coordinates), or None.
+            score (float): Score of the position.
+            depth (int): Remaining depth of the search that produced the score.
+            bound (int): EXACT, LOWER or UPPER.
+
+        Returns:
+            None
+        """
+        index = key % self.buckets * 2
+        keys  = self.__keys
+        words = self.__data
+        move  = pack_move(move)
+
+        preferred_data = int(words[index])
+        preferred_key  = int(keys[index]) ^ preferred_data
+
+        # Keep the previous best move if the new search did not find one
+        if move == 0:
+            if preferred_key == key:
+                move = preferred_data & 0xFFFF
+            else:
+                other_data = int(words[index + 1])
+                if int(keys[index + 1]) ^ other_data == key:
+                    move = other_data & 0xFFFF
+
+        if (preferred_key == 0 or preferred_key == key or preferred_data >> 58 != self.generation
+                or depth >= (preferred_data >> 48) & 0xFF):
+            slot = index
+        else:
+            slot = index + 1
+
+        # Fixed point keeps the fractional scores of the threat and defense heuristics
+        score = score * SCORE_SCALE
+        score = SCORE_INF if score >= SCORE_INF else -SCORE_INF if score <= -SCORE_INF else round(score)
+        data  = move | (score & 0xFFFFFFFF) << 16 | min(depth, 255) << 48 | (bound | self.generation << 2) << 56
+
+        # The data word is written first: a process reading in between sees a key mismatch, not a wrong entry
+        words[slot] = data
+        keys[slot]  = key ^ data
+
+
+    def hashfull(self) -> float:
+        """
+        Estimate the fraction of slots used by the current search, on a sample of the table.
+
+        Returns:
+            float: Filled fraction between 0 and 1.
+        """
+        keys, data = self.__keys[:2000], self.__data[:2000]
+        return float(np.mean((keys != 0) & (data >> np.uint64(58) == self.generation)))
@@ -0,0 +1,381 @@
+import multiprocessing
+import queue
+import numpy as np
+from transposition import TranspositionTable
+from move_ordering import MoveOrderer
+
+# Remaining depth from which a node can become a split point, shallower subtrees are not worth sending to a helper
+SPLIT_MIN_DEPTH = 3
+
+# Maximum number of nested split points along the line searched by the main process
+MAX_SPLITS = 64
+
+# Seconds between two checks of the budgets while waiting for the helpers
+POLL_INTERVAL = 0.005
+
+
+class _SplitAbort:
+    """
+    Stop condition of a helper, set by the main process when the split point of its move is cut off.
+    It replaces the stop event read by Board._out_of_budget().
+    """
+
+    def __init__(self, aborted, slot: int) -> None:
+        """
+        Watch the abort flag of a split point.
+
+        Args:
+            aborted (RawArray): Abort flag of each split point, indexed by nesting level.
+            slot (int): Nesting level of the split point.
+        """
+        self.aborted = aborted
+        self.slot    = slot
+
+
+    def is_set(self) -> bool:
+        """
+        Read the abort flag, like Event.is_set().
+
+        Returns:
+            bool: True if the split point was aborted.
+        """
+        return bool(self.aborted[self.slot])
+
+
+class _SplitPoint:
+    """
+    Node of the main process whose younger moves are searched by the helpers, with its best move so far.
+    """
+
+    def __init__(self, beta: float, moves: int) -> None:
+        """
+        Open a split point with no result yet.
+
+        Args:
+            beta (float): Score above which the node is cut off.
+            moves (int): Number of moves shared with the helpers.
+        """
+        self.beta        = beta
+        self.outstanding = moves # Moves whose result has not been received yet
+        self.best_coord  = None
+        self.best_move   = None
+        self.best_eval   = -np.inf
+        self.best_exact  = False
+
+
+def _helper(tt_size: int, tt_name: str, tasks, results, aborted, alphas, idle, queued) -> None:
+    """
+    Loop of a helper process: take the moves offered at the split points by the main process and search them.
+
+    Args:
+        tt_size (int): Size of the shared transposition table in megabytes.
+        tt_name (str): Name of the shared memory block of the transposition table.
+        tasks (Queue): Moves to search, as (split point, serialized board, piece coordinates, move coordinates,
+            depth, beta, ply, extensions, table generation), None to quit.
+        results (Queue): Results sent back, as (split point, piece coordinates, move coordinates, score or None,
+            True if the score is exact, nodes, quiescence nodes).
+        aborted (RawArray): Abort flag of each split point.
+        alphas (RawArray): Best score of each split point, raised by the main process as the results come in.
+        idle (Value): Number of helpers waiting for a move.
+        queued (Value): Number of moves waiting in the queue.
+
+    Returns:
+        None
+    """
+    tt = TranspositionTable(tt_size, name=tt_name)
+    ordering = MoveOrderer() # Killer and history tables, kept warm between the moves searched
+    while True:
+        with idle.get_lock():
+            idle.value += 1
+        task = tasks.get()
+        with idle.get_lock():
+            idle.value -= 1
+        if task is None:
+            break
+        with queued.get_lock():
+            queued.value -= 1
+
+        slot, state, coord, move, depth, beta, ply, extensions, generation = task
+        if aborted[slot]:
+            results.put((slot, coord, move, None, False, 0, 0))
+            continue
+        if tt.generation != generation:
+            tt.generation = generation
+            ordering.age()
+
+        board = state[0]._from_state(state, tt)
+        board.ordering = ordering
+        board._set_limits(None, None, _SplitAbort(aborted, slot))
+
+        alpha = alphas[slot]
+        eval  = board._search_split_move(coord, move, depth, alpha, beta, ply, extensions)
+        results.put((slot, coord, move, eval, eval is not None and eval > alpha, board.stats.nodes, board.stats.qnodes))
+    tt.close()
+
+
+class YBWC:
+    """
+    Young Brothers Wait Concept parallel search: the main process runs the usual negamax, and at each node
+    deep enough, once the first move has been searched alone, the younger moves are offered to the idle
+    helpers through a shared queue. The main process takes moves from the same queue until it is empty,
+    then waits for the results of the helpers. A move failing high aborts the helpers still searching the
+    moves of its split point, and of the split points nested below it.
+
+    Only the main process opens split points, the helpers search their moves serially. The split points of
+    the main process can be nested: while searching a move of a split point, it opens a new one deeper in
+    the tree once the queue is empty and a helper is idle.
+    """
+
+    def __init__(self, threads: int, tt: TranspositionTable) -> None:
+        """
+        Start the helper processes, which stay alive between searches.
+
+        Args:
+            threads (int): Number of processes searching, including the main one.
+            tt (TranspositionTable): Transposition table in shared memory.
+        """
+        if tt.shm is None:
+            raise ValueError("YBWC needs a transposition table in shared memory, create it with shared=True")
+
+        self.threads = threads
+        self.tasks   = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.aborted = multiprocessing.RawArray("b", MAX_SPLITS)
+        self.alphas  = multiprocessing.RawArray("d", MAX_SPLITS)
+        self.idle    = multiprocessing.Value("i", 0)
+        self.queued  = multiprocessing.Value("i", 0)
+        self.helpers = [multiprocessing.Process(target=_helper, args=(tt.size_mb, tt.shm.name, self.tasks, self.results,
+                                                                      self.aborted, self.alphas, self.idle, self.queued), daemon=True)
+                        for _ in range(threads - 1)]
+        for helper in self.helpers:
+            helper.start()
+        self.__splits = [] # Open split points of the main process, indexed by nesting level
+
+
+    def search(self, board, time_ms: float, nodes: int, max_depth: int) -> tuple:
+        """
+        Search a position with every process, see Board.search for the arguments.
+
+        Args:
+            board (Board): Board of the main process, its statistics and tables being already set up.
+            time_ms (float): Time budget in milliseconds, unlimited if None.
+            nodes (int): Node budget, counting the nodes of the helpers, unlimited if None.
+            max_depth (int): Depth of the last iteration.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and the evaluation score of the last completed iteration.
+        """
+        board.stats.threads = self.threads
+        board.splitter = self
+        try:
+            return board._iterative_deepening(time_ms, nodes, max_depth)
+        finally:
+            board.splitter = None
+
+
+    def can_split(self, depth: int) -> bool:
+        """
+        Check whether the node being searched by the main process should become a split point.
+
+        Args:
+            depth (int): Remaining depth of the node.
+
+        Returns:
+            bool: True if the node is deep enough, a helper is idle and no move is waiting in the queue.
+        """
+        slot = len(self.__splits)
+        if depth < SPLIT_MIN_DEPTH or slot >= MAX_SPLITS or (slot > 0 and self.aborted[slot - 1]):
+            return False
+        return self.idle.value > 0 and self.queued.value == 0
+
+
+    def split(self, board, moves: list, depth: int, alpha: float, beta: float, ply: int, extensions: int) -> tuple:
+        """
+        Search the younger moves of a node together with the helpers, its first move being already searched.
+
+        Args:
+            board (Board): Board of the main process, at the split point.
+            moves (list): Moves left to search, as (piece coordinates, move coordinates).
+            depth (int): Remaining depth of the node.
+            alpha (float): Score the side to move is already guaranteed.
+            beta (float): Score above which the node is cut off.
+            ply (int): Distance to the root of the search.
+            extensions (int): Check extensions already granted on the line.
+
+        Returns:
+            tuple: Best piece coordinates, best move coordinates and score among the moves, or None if the
+            search was stopped, by the budgets or by a cutoff of an enclosing split point.
+        """
+        slot = len(self.__splits)
+        split_point = _SplitPoint(beta, len(moves))
+        self.__splits.append(split_point)
+        self.aborted[slot] = 0
+        self.alphas[slot]  = alpha
+        board.stats.splits += 1
+
+        state = board._state()
+        with self.queued.get_lock():
+            self.queued.value += len(moves)
+        for coord, move in moves:
+            self.tasks.put((slot, state, coord, move, depth, beta, ply, extensions, board.tt.generation))
+
+        try:
+            while split_point.outstanding:
+                task = self.__take()
+                if task is not None:
+                    _, _, coord, move, *_ = task
+                    if self.aborted[slot]:
+                        self.__record(board, slot, coord, move, None, False)
+                        continue
+                    # The main process helps with its own split point while moves are left in the queue
+                    alpha = self.alphas[slot]
+                    eval  = board._search_split_move(coord, move, depth, alpha, beta, ply, extensions)
+                    self.__record(board, slot, coord, move, eval, eval is not None and eval > alpha)
+                    continue
+
+                try:
+                    result_slot, coord, move, eval, exact, helper_nodes, helper_qnodes = self.results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    if not all(helper.is_alive() for helper in self.helpers):
+                        raise RuntimeError("A helper process of the parallel search died")
+                    if not self.aborted[slot] and board._out_of_budget():
+                        self.__abort(slot)
+                    continue
+                board.stats.nodes  += helper_nodes
+                board.stats.qnodes += helper_qnodes
+                self.__record(board, result_slot, coord, move, eval, exact)
+        finally:
+            self.__splits.pop()
+
+        if split_point.best_eval >= beta or not self.aborted[slot]:
+            return split_point.best_coord, split_point.best_move, split_point.best_eval
+        return None
+
+
+    def __take(self) -> tuple:
+        """
+        Take a move from the queue without waiting.
+
+        Returns:
+            tuple: Task of the queue, or None if it is empty.
+        """
+        try:
+            task = self.tasks.get_nowait()
+        except queue.Empty:
+            return None
+        with self.queued.get_lock():
+            self.queued.value -= 1
+        return task
+
+
+    def __record(self, board, slot: int, coord: tuple, move: tuple, eval: float, exact: bool) -> None:
+        """
+        Record the result of a move at its split point, which is not always the innermost one.
+
+        Args:
+            board (Board): Board of the main process.
+            slot (int): Nesting level of the split point.
+            coord (tuple): Coordinates of the moved piece.
+            move (tuple): Coordinates of the destination square.
+            eval (float): Score of the move for the side to move at the split point, or None if it was not searched.
+            exact (bool): True if the score is exact rather than an upper bound.
+
+        Returns:
+            None
+        """
+        split_point = self.__splits[slot]
+        split_point.outstanding -= 1
+        if eval is None:
+            # A move is only left unsearched when the split point is aborted or the budget is exhausted
+            if not self.aborted[slot]:
+                self.__abort(slot)
+            return
+
+        # An upper bound equal to the best score is not better than it
+        if eval > split_point.best_eval or (eval == split_point.best_eval and exact and not split_point.best_exact):
+            split_point.best_coord, split_point.best_move = coord, move
+            split_point.best_eval,  split_point.best_exact = eval, exact
+        if eval > self.alphas[slot]:
+            self.alphas[slot] = eval
+        if eval >= split_point.beta and not self.aborted[slot]:
+            self.__abort(slot)
+
+
+    def __abort(self, slot: int) -> None:
+        """
+        Abort a split point and the split points nested below it, which belong to its subtree.
+
+        Args:
+            slot (int): Nesting level of the split point.
+
+        Returns:
+            None
+        """
+        for nested in range(slot, len(self.__splits)):
+            self.aborted[nested] = 1
+
+
+    def close(self) -> None:
+        """
+        Stop the helper processes.
+
+        Returns:
+            None
+        """
+        for _ in self.helpers:
+            self.tasks.put(None)
+        for helper in self.helpers:
+            helper.join(timeout=1)
+            if helper.is_alive():
+                helper.terminate()
+
+
+def benchmark(board, depth: int, thread_counts: list = (1, 2, 4), hash_size: int = 64) -> list:
+    """
+    Search a position at a fixed depth with each number of threads, on a fresh transposition table each
+    time, and compare with the serial search. The speedup is the ratio of the search times, the search
+    overhead the fraction of extra nodes visited by the parallel search.
+
+    Args:
+        board (Board): Position to search, left untouched.
+        depth (int): Depth of the searches.
+        thread_counts (list): Numbers of threads to try, the first one being the reference.
+        hash_size (int): Size of the transposition tables in megabytes.
+
+    Returns:
+        list: (threads, seconds, nodes, speedup, search overhead) for each number of threads.
+    """
+    rows = []
+    for threads in thread_counts:
+        copy = board._from_state(board._state(), TranspositionTable(hash_size, shared=threads > 1))
+        try:
+            copy.search(max_depth=depth, threads=threads, parallel="ybwc")
+        finally:
+            copy.close()
+        stats = copy.stats
+        nodes = stats.nodes + stats.qnodes
+        if not rows:
+            reference_time, reference_nodes = stats.elapsed, nodes
+        rows.append((threads, stats.elapsed, nodes, reference_time / stats.elapsed, nodes / reference_nodes - 1))
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    from board_ia import Board
+    from bitboard import BitBoard
+    from mailbox_board import MailboxBoard
+
+    BACKENDS = {"numpy": Board, "bitboard": BitBoard, "mailbox": MailboxBoard}
+
+    parser = argparse.ArgumentParser(description="Measure the speedup and search overhead of the YBWC search from the initial position")
+    parser.add_argument("--depth", type=int, default=4, help="Depth of the searches (default: 4)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4], help="Numbers of threads to try (default: 1 2 4)")
+    parser.add_argument("--hash", type=int, default=64, help="Size of the transposition tables in MB (default: 64)")
+    parser.add_argument("--backend", choices=BACKENDS, default="bitboard", help="Board representation (default: bitboard)")
+
+    args = parser.parse_args()
+
+    print("threads    time     nodes  speedup  overhead")
+    for threads, elapsed, nodes, speedup, overhead in benchmark(BACKENDS[args.backend](), args.depth, args.threads, args.hash):
+        print(f"{threads:7d} {elapsed:7.2f}s {nodes:9d} {speedup:7.2f}x {overhead:8.1%}")
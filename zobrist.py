@@ -0,0 +1,59 @@
+from random import Random
+from piece import PieceValues
+
+# Fixed seed so that keys are reproducible between runs (and between processes)
+_RANDOM = Random(0x5EED)
+
+# One random 64-bit key per (piece value, x, y)
+ZOBRIST_PIECES = {
+    piece.value: [[_RANDOM.getrandbits(64) for _ in range(8)] for _ in range(8)]
+    for piece in PieceValues
+}
+
+# Key toggled every time the side to move changes
+ZOBRIST_SIDE = _RANDOM.getrandbits(64)
+
+# One random key per (x, y), present while an unmoved king or rook stands on the square: together they encode the castling rights
+ZOBRIST_CASTLING = [[_RANDOM.getrandbits(64) for _ in range(8)] for _ in range(8)]
+
+# Pieces whose moved flag decides the castling rights
+CASTLING_PIECES = (PieceValues.KING_WHITE.value, PieceValues.ROOK_WHITE.value)
+
+
+def zobrist_hash(grid, moved=None) -> int:
+    """
+    Compute from scratch the Zobrist key of a board layout, White to move.
+
+    Args:
+        grid (ArrayLike): 2D array representing the piece layout
+        moved (ArrayLike): 2D array of the moved flags, the castling rights are left out of the key if None
+
+    Returns:
+        int: 64-bit Zobrist key of the layout
+    """
+    key = 0
+    for x in range(8):
+        for y in range(8):
+            key ^= square_key(int(grid[x, y]), x, y, moved is None or bool(moved[x, y]))
+    return key
+
+
+def square_key(piece: int, x: int, y: int, moved: bool) -> int:
+    """
+    Return the part of the Zobrist key given by one square, to XOR in or out when the square changes.
+
+    Args:
+        piece (int): Piece value on the square, 0 if empty
+        x (int): Column of the square
+        y (int): Row of the square
+        moved (bool): Moved flag of the square
+
+    Returns:
+        int: Key of the piece, with the castling key of an unmoved king or rook
+    """
+    if piece == 0:
+        return 0
+    key = ZOBRIST_PIECES[piece][x][y]
+    if abs(piece) in CASTLING_PIECES and not moved:
+        key ^= ZOBRIST_CASTLING[x][y]
+    return key